@@ -1,7 +1,10 @@
 # app/__init__.py
 from flask import Flask
 from .config import Config
-from .extensions import db, migrate, login_manager
+from .extensions import db, migrate, login_manager, init_read_routing
+from .metrics import init_metrics
+from .idempotency import init_idempotency
+from .throttle import TTLCache, TokenBucketLimiter
 from datetime import timedelta
 
 def create_app():
@@ -14,6 +17,15 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    init_read_routing(app)
+    init_metrics(app)
+    init_idempotency(app)
+
+    # 캘린더 API 응답 캐시 / 요청 제한
+    app.extensions["calendar_cache"] = TTLCache(app.config["CALENDAR_CACHE_TTL"])
+    app.extensions["calendar_limiter"] = TokenBucketLimiter(
+        app.config["CALENDAR_RATE_PER_SECOND"], app.config["CALENDAR_RATE_BURST"]
+    )
 
     # 로그인 사용자 불러오기 함수 등록
     from .models import User
@@ -33,4 +45,19 @@ def create_app():
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
 
+    # 신청 가능 연차 재계산 대기열 (before_flush 훅 등록)
+    from . import projections
+
+    # CLI 명령 등록
+    from .reports import usage_report_command
+    from .accrual import accrue_command
+    from .hierarchy import department_cli
+    from .consistency import check_balances_command
+
+    app.cli.add_command(usage_report_command)
+    app.cli.add_command(projections.recompute_requestable_command)
+    app.cli.add_command(accrue_command)
+    app.cli.add_command(department_cli)
+    app.cli.add_command(check_balances_command)
+
     return app
@@ -0,0 +1,183 @@
+# app/accrual.py
+import calendar
+import time
+from datetime import date, datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, extract, literal, or_, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .extensions import db
+from .models import User, LeaveBalance, DirtyUser, AccrualRun
+
+# 방언별 INSERT ... ON CONFLICT 지원
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+# ------------------- 정책 -------------------
+class AccrualPolicy:
+    """연차 발생 정책
+
+    monthly_days: 입사 1년 미만일 때 근속 1개월마다 발생하는 일수
+    monthly_cap: 입사 1년 미만 발생 한도
+    tiers: (근속 연수, 연간 일수) 목록. 근속 연수가 가장 큰 해당 구간 적용
+    cap: 연간 최대 일수
+    """
+
+    def __init__(self, monthly_days=1.0, monthly_cap=11.0, tiers=((1, 15.0),), cap=25.0):
+        tiers = sorted(tiers)
+        if not tiers or tiers[0][0] != 1:
+            raise ValueError("tiers 는 근속 1년 구간부터 시작해야 합니다.")
+        self.monthly_days = monthly_days
+        self.monthly_cap = monthly_cap
+        self.tiers = tiers
+        self.cap = cap
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+    def days_for_months(self, months):
+        """근속 개월 수 → 연간 발생 일수 (입사 1년 미만은 입사 후 누적 일수)"""
+        if months < 12:
+            return min(max(months, 0) * self.monthly_days, self.monthly_cap)
+        years = months // 12
+        days = [d for y, d in self.tiers if years >= y][-1]
+        return min(days, self.cap)
+
+    def days_for_year(self, months, months_before_year):
+        """해당 연도 연차에 기록할 일수 (Python 계산, 확인용)
+
+        months: 기준일의 근속 개월 수, months_before_year: 전년도 말일의 근속 개월 수.
+        입사 1년 미만의 월별 발생분은 입사 연도와 다음 연도에 걸치므로, 전년도 말까지
+        발생한 일수를 빼고 그 해에 발생한 만큼만 기록한다 (두 해 합계가 monthly_cap 이하).
+        근속 1년이 되면 구간 일수를 더하되, 그 해 입사 기념일 전에 발생한 월별 일수는
+        그대로 남긴다 (2025-03-01 입사자의 2026 년 연차 = 2일 + 15일).
+        """
+        first_year = min(months, 11), min(months_before_year, 11)
+        monthly = self.days_for_months(first_year[0]) - self.days_for_months(first_year[1])
+        if months >= 12:
+            return self.days_for_months(months) + monthly
+        return monthly
+
+    def _monthly_expression(self, months):
+        # 월별 발생은 근속 11개월까지
+        monthly = case((months > 11, 11), else_=months) * self.monthly_days
+        return case(
+            (monthly > self.monthly_cap, self.monthly_cap),
+            (monthly < 0, 0.0),
+            else_=monthly,
+        )
+
+    def days_expression(self, months, months_before_year):
+        """근속 개월 수 SQL 식 → 해당 연도 발생 일수 SQL 식 (days_for_year 와 같은 규칙)"""
+        tier_cases = [
+            (months >= years * 12, min(days, self.cap))
+            for years, days in reversed(self.tiers)
+        ]
+        monthly = self._monthly_expression(months) - self._monthly_expression(months_before_year)
+        return case(*tier_cases, else_=0.0) + monthly
+
+
+# ------------------- 배치 -------------------
+def period_end(period):
+    """'YYYY-MM' → 그 달의 마지막 날"""
+    year, month = (int(p) for p in period.split("-"))
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def service_months(as_of):
+    """as_of 기준 만 근속 개월 수 SQL 식"""
+    return (
+        (as_of.year - extract("year", User.hire_date)) * 12
+        + (as_of.month - extract("month", User.hire_date))
+        - case((extract("day", User.hire_date) > as_of.day, 1), else_=0)
+    )
+
+
+def run_accrual(period, policy, force=False):
+    """period('YYYY-MM') 말일 기준으로 모든 직원의 해당 연도 총 연차를 계산해 반영
+
+    입사 1년 미만의 월별 발생분은 그 해에 발생한 개월만 해당 연도 연차에 기록하고,
+    근속 1년이 되는 해에는 구간 일수에 더한다 (AccrualPolicy.days_for_year 참고).
+
+    발생 일수는 집합 연산 한 번으로 계산해 INSERT ... ON CONFLICT 로 기록한다.
+    총 연차를 '더하지' 않고 '설정'하므로 같은 기간을 다시 실행해도 결과가 같으며,
+    이미 실행한 기간은 force 가 아니면 건너뛴다. 반영된 인원 수를 반환 (건너뛰면 None).
+    """
+    if not force and db.session.get(AccrualRun, period):
+        return None
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise RuntimeError(f"{dialect} 는 연차 일괄 발생을 지원하지 않습니다.")
+    insert = UPSERT_INSERTS[dialect]
+
+    as_of = period_end(period)
+    year = as_of.year
+    accrued = policy.days_expression(service_months(as_of), service_months(date(year - 1, 12, 31)))
+
+    accruals = (
+        select(User.id.label("user_id"), accrued.label("total_days"))
+        .where(User.hire_date.is_not(None), User.hire_date <= as_of)
+        .subquery()
+    )
+    changed = (
+        select(accruals.c.user_id, accruals.c.total_days)
+        .outerjoin(
+            LeaveBalance,
+            and_(LeaveBalance.user_id == accruals.c.user_id, LeaveBalance.year == year),
+        )
+        .where(or_(LeaveBalance.id.is_(None), LeaveBalance.total_days != accruals.c.total_days))
+    )
+
+    # 총 연차가 바뀌는 직원만 신청 가능 연차 재계산 대기열에 추가
+    now = datetime.now()
+    mark = insert(DirtyUser).from_select(
+        ["user_id", "marked_at"],
+        # SQLite 의 INSERT ... SELECT ... ON CONFLICT 는 WHERE 절이 있어야 함
+        select(changed.subquery().c.user_id, literal(now, db.DateTime)).where(true()),
+    )
+    db.session.execute(mark.on_conflict_do_update(
+        index_elements=[DirtyUser.user_id],
+        set_={"marked_at": mark.excluded.marked_at},
+    ))
+
+    changed = changed.subquery()
+    upsert = insert(LeaveBalance).from_select(
+        ["user_id", "year", "total_days", "used_days", "pending_days"],
+        select(changed.c.user_id, literal(year), changed.c.total_days, literal(0.0), literal(0.0)).where(true()),
+    )
+    result = db.session.execute(upsert.on_conflict_do_update(
+        index_elements=[LeaveBalance.user_id, LeaveBalance.year],
+        set_={"total_days": upsert.excluded.total_days},
+    ))
+
+    run = db.session.get(AccrualRun, period) or AccrualRun(period=period)
+    run.users = result.rowcount
+    run.ran_at = now
+    db.session.add(run)
+    db.session.commit()
+    return result.rowcount
+
+
+# ------------------- CLI -------------------
+@click.command("accrue")
+@click.option("--period", default=lambda: date.today().strftime("%Y-%m"), help="기준 월 (YYYY-MM, 기본값: 이번 달)")
+@click.option("--force", is_flag=True, help="이미 실행한 기간도 다시 계산")
+@with_appcontext
+def accrue_command(period, force):
+    """정책에 따라 연차를 일괄 발생 (매월 스케줄러에서 실행)"""
+    policy = AccrualPolicy.from_config(current_app.config["ACCRUAL_POLICY"])
+
+    started = time.perf_counter()
+    updated = run_accrual(period, policy, force=force)
+    if updated is None:
+        click.echo(f"{period} 은(는) 이미 처리되었습니다. 다시 계산하려면 --force 를 사용하세요.")
+        return
+    click.echo(f"{period}: {updated}명 연차 반영 ({time.perf_counter() - started:.2f}s)")
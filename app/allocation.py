@@ -0,0 +1,70 @@
+# app/allocation.py
+from collections import namedtuple
+
+# 연도별 차감 대상
+#   available: 차감 가능한 일수 (신청/승인 시 total - used, 삭제 시 used)
+#   expires_on: 이 날짜 이후에 시작하는 휴가에는 사용할 수 없음 (None 이면 만료 없음)
+YearBalance = namedtuple("YearBalance", ["year", "available", "expires_on"])
+
+# allocate() 결과
+#   deductions: 휴가별 {year: 차감일수} (입력 휴가 순서)
+#   shortfalls: 휴가별 차감하지 못한 일수
+#   remaining: 모든 휴가 차감 후 연도별 남은 일수
+Allocation = namedtuple("Allocation", ["deductions", "shortfalls", "remaining"])
+
+
+def balances_for_use(balances):
+    """LeaveBalance 목록 → 사용 가능 일수(total - used) 기준 YearBalance 목록"""
+    return [
+        YearBalance(b.year, (b.total_days or 0.0) - (b.used_days or 0.0), b.expires_on)
+        for b in balances
+    ]
+
+
+def balances_for_release(balances):
+    """LeaveBalance 목록 → 복원 가능 일수(used) 기준 YearBalance 목록 (만료 무시)"""
+    return [YearBalance(b.year, b.used_days or 0.0, None) for b in balances]
+
+
+def allocate(balances, leaves):
+    """이전 연도부터 차감하는 방식으로 모든 휴가의 연도별 차감일수를 한 번에 계산
+
+    balances: YearBalance 목록
+    leaves: (start_date, days) 목록 (시작일 오름차순)
+
+    휴가는 시작 연도 이하의, 만료되지 않은 연차에서만 차감한다.
+    휴가가 시작일 순이므로 한 번 소진되거나 만료된 연도는 이후 휴가에도
+    쓸 수 없어, 가장 오래된 사용 가능 연도를 가리키는 커서를 앞으로만
+    옮기며 전체를 한 번에 처리한다 (휴가마다 연도를 처음부터 다시 훑지 않음).
+    """
+    balances = sorted(balances, key=lambda b: b.year)
+    years = [b.year for b in balances]
+    available = [max(b.available, 0.0) for b in balances]
+    expires = [b.expires_on for b in balances]
+
+    deductions = []
+    shortfalls = []
+    first = 0  # 아직 소진/만료되지 않은 가장 오래된 연도
+    for start_date, days in leaves:
+        # 앞쪽의 소진되었거나 만료된 연도는 다시 보지 않음
+        while first < len(years) and (
+            available[first] <= 0
+            or (expires[first] is not None and start_date > expires[first])
+        ):
+            first += 1
+
+        remaining = days
+        deduction = {}
+        i = first
+        while remaining > 0 and i < len(years) and years[i] <= start_date.year:
+            if available[i] > 0 and (expires[i] is None or start_date <= expires[i]):
+                deduct = min(available[i], remaining)
+                available[i] -= deduct
+                remaining -= deduct
+                deduction[years[i]] = deduct
+            i += 1
+
+        deductions.append(deduction)
+        shortfalls.append(remaining)
+
+    return Allocation(deductions, shortfalls, dict(zip(years, available)))
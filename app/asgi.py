@@ -0,0 +1,247 @@
+# app/asgi.py
+import json
+import math
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from .models import User, Department, Leave, LeaveBalance, RequestableDays, DirtyUser, count_leave_days, expired_years, requestable_from
+from .allocation import balances_for_use
+from .routes import load_calendar_events, parse_calendar_day
+from .throttle import AsyncSingleFlight
+from . import metrics
+from .metrics import request_latency, requests_total
+
+# 동기 드라이버 → asyncio 드라이버
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(uri):
+    url = make_url(uri)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+class AsgiApp:
+    """JSON 조회 API 는 asyncio 로 직접 처리하고 나머지(HTML 화면 등)는 Flask(WSGI)로 넘기는 ASGI 앱"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.engine = create_async_engine(async_database_url(flask_app.config["SQLALCHEMY_DATABASE_URI"]))
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.calendar_flight = AsyncSingleFlight()
+        self.routes = {
+            "/api/leaves": self.api_leaves,
+            "/api/me/leaves": self.api_my_leaves,
+            "/api/me/balances": self.api_my_balances,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        handler = self.routes.get(scope.get("path"))
+        if scope["type"] != "http" or scope["method"] != "GET" or handler is None:
+            return await self.wsgi(scope, receive, send)
+
+        started = time.perf_counter()
+        status, body, headers = await handler(scope)
+        await self.send_json(send, status, body, headers)
+
+        endpoint = f"asgi:{scope['path']}"
+        request_latency.observe(time.perf_counter() - started, endpoint=endpoint, method="GET")
+        requests_total.inc(endpoint=endpoint, method="GET", status=status)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def send_json(self, send, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ]
+        raw_headers += [(k.lower().encode(), str(v).encode()) for k, v in (headers or {}).items()]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    # ------------------- 요청 정보 -------------------
+    def query_args(self, scope):
+        return dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+
+    def current_user_id(self, scope):
+        """Flask 세션 쿠키에서 Flask-Login 사용자 id 를 읽음 (없거나 위조면 None)"""
+        cookies = SimpleCookie()
+        for name, value in scope.get("headers", []):
+            if name == b"cookie":
+                cookies.load(value.decode("latin-1"))
+
+        cookie = cookies.get(self.flask_app.config["SESSION_COOKIE_NAME"])
+        if cookie is None:
+            return None
+
+        serializer = self.flask_app.session_interface.get_signing_serializer(self.flask_app)
+        max_age = int(self.flask_app.permanent_session_lifetime.total_seconds())
+        try:
+            data = serializer.loads(cookie.value, max_age=max_age)
+        except Exception:
+            return None
+
+        user_id = data.get("_user_id")
+        return int(user_id) if user_id else None
+
+    async def current_user(self, scope):
+        """세션 쿠키의 사용자 (id, role, path) 행. 로그인하지 않았거나 삭제된 사용자면 None
+
+        Flask-Login 의 user_loader 처럼 요청마다 사용자 행을 확인한다.
+        """
+        user_id = self.current_user_id(scope)
+        if user_id is None:
+            return None
+        async with self.session() as session:
+            return (await session.execute(
+                select(User.id, User.role, Department.path)
+                .outerjoin(Department, Department.id == User.department_id)
+                .where(User.id == user_id)
+            )).first()
+
+    @staticmethod
+    def calendar_scope(user):
+        """hierarchy.calendar_scope 와 같은 규칙으로 캘린더 부서 경로 결정"""
+        return None if user.role == "admin" else user.path
+
+    # ------------------- 캘린더 API -------------------
+    async def api_leaves(self, scope):
+        metrics.calendar_requests.inc()
+        user = await self.current_user(scope)
+        if user is None:
+            return 401, {"error": "로그인이 필요합니다."}, None
+
+        allowed, retry_after = self.flask_app.extensions["calendar_limiter"].allow(f"user:{user.id}")
+        if not allowed:
+            metrics.calendar_throttled.inc()
+            return 429, {"error": "요청이 너무 많습니다. 잠시 후 다시 시도하세요."}, {"Retry-After": math.ceil(retry_after)}
+
+        args = self.query_args(scope)
+        try:
+            start, end = parse_calendar_day(args.get("start")), parse_calendar_day(args.get("end"))
+        except ValueError:
+            return 400, {"error": "잘못된 날짜 형식입니다."}, None
+        window = (start, end, self.calendar_scope(user))
+
+        cache = self.flask_app.extensions["calendar_cache"]
+        events = cache.get(window)
+        if events is not None:
+            metrics.calendar_cache_hits.inc()
+            return 200, events, None
+
+        async def compute():
+            metrics.calendar_computed.inc()
+            async with self.session() as session:
+                result = await session.run_sync(lambda s: load_calendar_events(*window, session=s))
+            cache.set(window, result)
+            return result
+
+        events, shared = await self.calendar_flight.do(window, compute)
+        if shared:
+            metrics.calendar_coalesced.inc()
+        return 200, events, None
+
+    # ------------------- 내 휴가 / 연차 -------------------
+    async def api_my_leaves(self, scope):
+        user = await self.current_user(scope)
+        if user is None:
+            return 401, {"error": "로그인이 필요합니다."}, None
+        user_id = user.id
+
+        async with self.session() as session:
+            rows = (await session.execute(
+                select(Leave.id, Leave.start_date, Leave.end_date, Leave.half_day, Leave.status, Leave.reason)
+                .where(Leave.user_id == user_id)
+                .order_by(Leave.start_date)
+            )).all()
+
+        return 200, [
+            {
+                "id": r.id,
+                "start_date": r.start_date.isoformat(),
+                "end_date": r.end_date.isoformat(),
+                "half_day": bool(r.half_day),
+                "status": r.status,
+                "reason": r.reason or "",
+                "days": count_leave_days(r.start_date, r.end_date, r.half_day),
+            }
+            for r in rows
+        ], None
+
+    async def api_my_balances(self, scope):
+        user = await self.current_user(scope)
+        if user is None:
+            return 401, {"error": "로그인이 필요합니다."}, None
+        user_id = user.id
+
+        async with self.session() as session:
+            balances = (await session.execute(
+                select(
+                    LeaveBalance.year, LeaveBalance.total_days,
+                    LeaveBalance.used_days, LeaveBalance.expires_on,
+                )
+                .where(LeaveBalance.user_id == user_id)
+                .order_by(LeaveBalance.year)
+            )).all()
+            dirty = await session.get(DirtyUser, user_id)
+
+            # 프로젝션이 최신이면 그대로, 재계산 대기 중이면 직접 계산
+            if dirty is None:
+                projection = (await session.execute(
+                    select(RequestableDays.year, RequestableDays.days)
+                    .where(RequestableDays.user_id == user_id, RequestableDays.days > 0)
+                )).all()
+                expired = expired_years(balances)
+                requestable = {r.year: r.days for r in projection if r.year not in expired}
+            else:
+                pending = (await session.execute(
+                    select(Leave.start_date, Leave.end_date, Leave.half_day)
+                    .where(Leave.user_id == user_id, Leave.status == "Pending")
+                    .order_by(Leave.start_date)
+                )).all()
+                requestable = requestable_from(
+                    balances_for_use(balances),
+                    [(l.start_date, count_leave_days(l.start_date, l.end_date, l.half_day)) for l in pending],
+                )
+
+        return 200, [
+            {
+                "year": b.year,
+                "total_days": b.total_days or 0.0,
+                "used_days": b.used_days or 0.0,
+                "remaining_days": round((b.total_days or 0.0) - (b.used_days or 0.0), 1),
+                "requestable_days": requestable.get(b.year, 0.0),
+                "expires_on": b.expires_on.isoformat() if b.expires_on else None,
+            }
+            for b in balances
+        ], None
+
+
+def create_asgi_app(flask_app=None):
+    if flask_app is None:
+        from . import create_app
+        flask_app = create_app()
+    return AsgiApp(flask_app)
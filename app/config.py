@@ -6,3 +6,34 @@ class Config:
     SECRET_KEY = "dev"
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(basedir, "app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # 읽기 전용 엔진 (GET 요청 조회용). 로컬에서는 복제본 파일이나
+    # "sqlite:///file:/path/to/app.db?mode=ro&uri=true" 같은 읽기 전용 URI 를 지정
+    READ_REPLICA_URI = os.environ.get("READ_REPLICA_URI")
+    SQLALCHEMY_BINDS = {"replica": READ_REPLICA_URI} if READ_REPLICA_URI else {}
+    READ_AFTER_WRITE_SECONDS = 5  # 쓰기 요청 후 기본 엔진에서 읽는 시간 (초)
+
+    # 신청 가능 연차 백그라운드 재계산
+    REQUESTABLE_WORKER_ENABLED = True
+    REQUESTABLE_WORKER_THREADS = 4
+    REQUESTABLE_WORKER_BATCH_SIZE = 200
+    REQUESTABLE_WORKER_INTERVAL = 2.0  # 초
+
+    # 캘린더 API (/api/leaves) 캐시 및 사용자별 요청 제한
+    CALENDAR_CACHE_TTL = 5  # 초
+    CALENDAR_RATE_PER_SECOND = 2.0
+    CALENDAR_RATE_BURST = 10
+
+    # 휴가 신청/승인/반려/삭제 중복 제출 방지 (Idempotency-Key)
+    IDEMPOTENCY_TTL = 600  # 초
+    IDEMPOTENCY_MAX_KEYS = 10000
+
+    # 연차 발생 정책 (flask accrue)
+    #   입사 1년 미만: 1개월 근속마다 1일, 최대 11일
+    #   1년 이상: 15일, 3년차부터 2년마다 1일 가산, 최대 25일
+    ACCRUAL_POLICY = {
+        "monthly_days": 1.0,
+        "monthly_cap": 11.0,
+        "tiers": [(years, 15.0 + (years - 1) // 2) for years in range(1, 22, 2)],
+        "cap": 25.0,
+    }
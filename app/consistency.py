@@ -0,0 +1,154 @@
+# app/consistency.py
+import time
+from datetime import datetime
+from itertools import groupby
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, insert, select, update
+
+from .extensions import db
+from .models import Leave, LeaveBalance, DirtyUser, count_leave_days
+from .allocation import YearBalance, allocate
+from .reports import CHUNK_SIZE, iter_csv, iter_jsonl
+
+DRIFT_FIELDS = ["balance_id", "user_id", "year", "recorded_used_days", "expected_used_days", "difference"]
+
+
+# ------------------- 검증 -------------------
+def iter_balance_drift(summary=None, chunk_size=CHUNK_SIZE):
+    """승인된 휴가로 다시 계산한 사용 일수와 LeaveBalance.used_days 가 다른 연차를 한 행씩 생성
+
+    연차와 승인 휴가를 각각 user_id 순으로 스트리밍해 직원 단위로 병합하고,
+    used_days 를 0 으로 둔 연차에 승인 휴가를 시작일 순으로 다시 차감(allocate)한다.
+    한 번에 한 직원분만 메모리에 두므로 휴가 수와 상관없이 메모리 사용량이 일정하다.
+
+    summary 에 dict 를 넘기면 검사한 연차 수(balances), 차이가 난 연차 수(drifted),
+    어느 연차에서도 차감할 수 없는 승인 휴가 일수(unallocated_days)를 채운다.
+    """
+    if summary is None:
+        summary = {}
+    summary.update(balances=0, drifted=0, unallocated_days=0.0)
+
+    balances = db.session.execute(
+        select(
+            LeaveBalance.id, LeaveBalance.user_id, LeaveBalance.year,
+            LeaveBalance.total_days, LeaveBalance.used_days, LeaveBalance.expires_on,
+        )
+        .order_by(LeaveBalance.user_id, LeaveBalance.year)
+        .execution_options(yield_per=chunk_size)
+    )
+    approved = db.session.execute(
+        select(Leave.user_id, Leave.start_date, Leave.end_date, Leave.half_day)
+        .where(Leave.status == "Approved")
+        .order_by(Leave.user_id, Leave.start_date)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    def leave_days(rows):
+        return [(l.start_date, count_leave_days(l.start_date, l.end_date, l.half_day)) for l in rows]
+
+    approved_groups = groupby(approved, key=lambda row: row.user_id)
+    approved_user_id, approved_rows = next(approved_groups, (None, iter(())))
+
+    for user_id, rows in groupby(balances, key=lambda row: row.user_id):
+        rows = list(rows)
+
+        # 연차가 하나도 없는 직원의 승인 휴가는 전부 차감 불가
+        while approved_user_id is not None and approved_user_id < user_id:
+            summary["unallocated_days"] += sum(days for _, days in leave_days(approved_rows))
+            approved_user_id, approved_rows = next(approved_groups, (None, iter(())))
+
+        leaves = leave_days(approved_rows) if approved_user_id == user_id else []
+
+        allocation = allocate([YearBalance(r.year, r.total_days or 0.0, r.expires_on) for r in rows], leaves)
+        summary["unallocated_days"] += sum(allocation.shortfalls)
+
+        expected_by_year = {}
+        for deduction in allocation.deductions:
+            for year, days in deduction.items():
+                expected_by_year[year] = expected_by_year.get(year, 0.0) + days
+
+        for r in rows:
+            summary["balances"] += 1
+            recorded = round(r.used_days or 0.0, 1)
+            expected = round(expected_by_year.get(r.year, 0.0), 1)
+            if recorded == expected:
+                continue
+            summary["drifted"] += 1
+            yield {
+                "balance_id": r.id,
+                "user_id": user_id,
+                "year": r.year,
+                "recorded_used_days": recorded,
+                "expected_used_days": expected,
+                "difference": round(recorded - expected, 1),
+            }
+
+    # 마지막 연차 보유 직원 뒤에 남은 승인 휴가
+    while approved_user_id is not None:
+        summary["unallocated_days"] += sum(days for _, days in leave_days(approved_rows))
+        approved_user_id, approved_rows = next(approved_groups, (None, iter(())))
+
+
+# ------------------- 복구 -------------------
+def _apply_repairs(batch):
+    db.session.execute(
+        update(LeaveBalance),
+        [{"id": row["balance_id"], "used_days": row["expected_used_days"]} for row in batch],
+    )
+    # 일괄 UPDATE 는 before_flush 훅을 거치지 않으므로 재계산 대기열에 직접 추가
+    user_ids = list({row["user_id"] for row in batch})
+    now = datetime.now()
+    db.session.execute(delete(DirtyUser).where(DirtyUser.user_id.in_(user_ids)))
+    db.session.execute(insert(DirtyUser), [{"user_id": user_id, "marked_at": now} for user_id in user_ids])
+
+
+def repair_balances(rows, batch_size=CHUNK_SIZE):
+    """iter_balance_drift 의 행을 그대로 넘겨주면서 batch_size 개씩 used_days 를 기대값으로 고침
+
+    읽기 커서와 같은 트랜잭션 안에서 executemany 로 반영하므로, 모두 소비한 뒤
+    호출한 쪽에서 commit 해야 한다.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        yield row
+        if len(batch) >= batch_size:
+            _apply_repairs(batch)
+            batch = []
+
+    if batch:
+        _apply_repairs(batch)
+
+
+# ------------------- CLI -------------------
+@click.command("check-balances")
+@click.option("--repair", is_flag=True, help="차이가 난 used_days 를 승인 휴가 기준으로 고침")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default="csv")
+@click.option("--batch-size", type=int, default=CHUNK_SIZE, show_default=True, help="읽기/수정 묶음 크기")
+@click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-")
+@with_appcontext
+def check_balances_command(repair, fmt, batch_size, output):
+    """연차 사용 일수(used_days)를 승인된 휴가와 대조해 차이 목록을 출력"""
+    started = time.perf_counter()
+    summary = {}
+    rows = iter_balance_drift(summary, chunk_size=batch_size)
+    if repair:
+        rows = repair_balances(rows, batch_size)
+
+    chunks = iter_jsonl(rows, batch_size) if fmt == "jsonl" else iter_csv(rows, DRIFT_FIELDS, batch_size)
+    for chunk in chunks:
+        output.write(chunk)
+
+    if repair:
+        db.session.commit()
+    else:
+        db.session.rollback()
+
+    click.echo(
+        f"연차 {summary['balances']}건 검사, 차이 {summary['drifted']}건"
+        f"{' 수정' if repair else ''}, 차감 불가 승인 휴가 {summary['unallocated_days']:g}일"
+        f" ({time.perf_counter() - started:.2f}s)",
+        err=True,
+    )
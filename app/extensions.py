@@ -1,11 +1,53 @@
 # app/extensions.py
+import time
+
+from flask import g, has_request_context, request, session
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
 from flask_login import LoginManager
 
-db = SQLAlchemy()
+# 조회 전용으로 보는 HTTP 메서드
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingSession(Session):
+    """읽기 전용 요청은 replica 엔진으로, 쓰기와 그 이후 조회는 기본 엔진으로 보내는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing:
+                # 이 세션에서 쓰기가 일어나면 이후 조회도 기본 엔진에서
+                self.info["wrote"] = True
+            elif not self.info.get("wrote") and has_request_context() and g.get("read_replica"):
+                engine = self._db.engines.get("replica")
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
 login_manager.login_message = "로그인이 필요합니다."
+
+
+def init_read_routing(app):
+    """GET 요청을 replica 로 보내고, 쓰기 요청 직후 잠시 동안은 기본 엔진에서 읽도록 설정"""
+    sticky_seconds = app.config.get("READ_AFTER_WRITE_SECONDS", 5)
+
+    @app.before_request
+    def route_reads():
+        # 방금 쓰기를 한 사용자는 자기 변경을 바로 볼 수 있도록 기본 엔진 사용
+        g.read_replica = (
+            request.method in READ_METHODS
+            and session.get("read_primary_until", 0) < time.time()
+        )
+
+    @app.after_request
+    def stick_to_primary(response):
+        if request.method not in READ_METHODS:
+            session["read_primary_until"] = time.time() + sticky_seconds
+        return response
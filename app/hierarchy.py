@@ -0,0 +1,151 @@
+# app/hierarchy.py
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, literal, select, true, update
+
+from .extensions import db
+from .models import User, Department
+
+department_cli = AppGroup("department", help="부서 트리 관리")
+
+
+# ------------------- 경로 / 범위 -------------------
+def subtree_bounds(path):
+    """path 하위(자기 자신 포함) 경로가 속하는 [lower, upper) 범위
+
+    "/1/4/" 하위 경로는 모두 "/1/4/" 로 시작하므로 "/1/4/" 이상 "/1/40" 미만이다
+    ('0' 은 '/' 바로 다음 문자). LIKE 대신 범위 조건을 써서 path 인덱스를 그대로 탄다.
+    """
+    return path, path[:-1] + chr(ord("/") + 1)
+
+
+def in_subtree(path_column, path):
+    lower, upper = subtree_bounds(path)
+    return (path_column >= lower) & (path_column < upper)
+
+
+def subtree_user_ids(path):
+    """path 하위 부서에 속한 직원 id 를 고르는 SELECT (서브쿼리로 사용)"""
+    return (
+        select(User.id)
+        .join(Department, Department.id == User.department_id)
+        .where(in_subtree(Department.path, path))
+    )
+
+
+# ------------------- 권한 범위 -------------------
+def is_manager(user):
+    return user.role == "manager" and user.department is not None
+
+
+def scope_condition(user, user_id_column):
+    """user 가 볼 수 있는 직원만 남기는 조건 (관리자: 전체, 매니저: 하위 부서, 직원: 본인)"""
+    if user.role == "admin":
+        return true()
+    if is_manager(user):
+        return user_id_column.in_(subtree_user_ids(user.department.path))
+    return user_id_column == user.id
+
+
+def can_manage(manager, user):
+    """manager 가 user 의 휴가를 승인/반려할 수 있는지 (매니저는 본인 휴가 제외)"""
+    if manager.role == "admin":
+        return True
+    if not is_manager(manager) or user.id == manager.id or user.department is None:
+        return False
+    lower, upper = subtree_bounds(manager.department.path)
+    return lower <= user.department.path < upper
+
+
+def calendar_scope(user):
+    """캘린더에 보여줄 부서 경로 (None 이면 전체)
+
+    매니저는 담당 하위 부서, 부서가 있는 직원은 자기 부서 하위를 본다.
+    """
+    if user is None or user.role == "admin" or user.department is None:
+        return None
+    return user.department.path
+
+
+# ------------------- 부서 변경 -------------------
+def create_department(name, parent=None):
+    department = Department(name=name, parent=parent)
+    db.session.add(department)
+    db.session.flush()  # id 확보
+    department.path = f"{parent.path if parent else '/'}{department.id}/"
+    return department
+
+
+def move_department(department, new_parent):
+    """부서를 new_parent 아래로 옮기고 하위 부서 경로를 UPDATE 한 번으로 갱신"""
+    if new_parent is not None:
+        lower, upper = subtree_bounds(department.path)
+        if lower <= new_parent.path < upper:
+            raise ValueError("하위 부서 아래로는 옮길 수 없습니다.")
+
+    old_path = department.path
+    new_path = f"{new_parent.path if new_parent else '/'}{department.id}/"
+
+    department.parent = new_parent
+    db.session.flush()
+    db.session.execute(
+        update(Department)
+        .where(in_subtree(Department.path, old_path))
+        .values(path=literal(new_path) + func.substr(Department.path, len(old_path) + 1))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.expire_all()
+
+
+# ------------------- CLI -------------------
+@department_cli.command("add")
+@click.argument("name")
+@click.option("--parent", "parent_id", type=int, default=None, help="상위 부서 id")
+def add_department_command(name, parent_id):
+    """부서 추가"""
+    parent = db.session.get(Department, parent_id) if parent_id else None
+    if parent_id and parent is None:
+        raise click.ClickException("상위 부서를 찾을 수 없습니다.")
+    department = create_department(name, parent)
+    db.session.commit()
+    click.echo(f"{department.id}\t{department.path}\t{department.name}")
+
+
+@department_cli.command("move")
+@click.argument("department_id", type=int)
+@click.option("--parent", "parent_id", type=int, default=None, help="새 상위 부서 id (없으면 최상위)")
+def move_department_command(department_id, parent_id):
+    """부서를 다른 상위 부서 아래로 이동"""
+    department = db.session.get(Department, department_id)
+    parent = db.session.get(Department, parent_id) if parent_id else None
+    if department is None or (parent_id and parent is None):
+        raise click.ClickException("부서를 찾을 수 없습니다.")
+    try:
+        move_department(department, parent)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+
+
+@department_cli.command("assign")
+@click.argument("email")
+@click.argument("department_id", type=int)
+@click.option("--manager", is_flag=True, help="해당 부서의 매니저로 지정")
+def assign_department_command(email, department_id, manager):
+    """직원을 부서에 배치"""
+    user = User.query.filter_by(email=email).first()
+    department = db.session.get(Department, department_id)
+    if user is None or department is None:
+        raise click.ClickException("직원 또는 부서를 찾을 수 없습니다.")
+    user.department = department
+    if manager:
+        user.role = "manager"
+    db.session.commit()
+
+
+@department_cli.command("list")
+def list_departments_command():
+    """부서 트리 출력"""
+    for department in Department.query.order_by(Department.path):
+        depth = department.path.count("/") - 2
+        click.echo(f"{'  ' * depth}{department.id}\t{department.name}")
@@ -0,0 +1,124 @@
+# app/idempotency.py
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import Response, current_app, make_response, request, session
+
+from .metrics import registry
+from .throttle import SingleFlight
+
+# 다시 보내 줄 응답의 최소 정보 (쿠키/세션은 저장하지 않음)
+#   fingerprint: 처음 요청의 폼 값 해시 (같은 키를 다른 내용에 다시 쓰는 것을 막음)
+StoredResponse = namedtuple("StoredResponse", ["status", "body", "location", "mimetype", "fingerprint"])
+
+replays = registry.counter("idempotent_replays_total", "같은 키로 다시 들어와 저장된 결과를 돌려준 요청 수")
+flight = SingleFlight()
+
+
+class IdempotencyStore:
+    """멱등 키 → 응답을 ttl 초 동안 보관 (오래된 것부터 max_entries 개까지만 유지)"""
+
+    def __init__(self, ttl=600, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return item[1]
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._items[key] = (now + self.ttl, value)
+            self._items.move_to_end(key)
+            # 앞쪽(오래된) 항목부터 만료되었거나 넘친 만큼 정리
+            while self._items:
+                oldest_key, (expires_at, _) = next(iter(self._items.items()))
+                if expires_at >= now and len(self._items) <= self.max_entries:
+                    break
+                del self._items[oldest_key]
+
+
+def _fingerprint():
+    """멱등 키를 뺀 폼 값의 해시"""
+    digest = hashlib.sha256()
+    for key, value in sorted(request.form.items(multi=True)):
+        if key != "idempotency_key":
+            digest.update(f"{key}={value}\0".encode())
+    return digest.hexdigest()
+
+
+def _snapshot(response, fingerprint):
+    return StoredResponse(
+        response.status_code,
+        response.get_data(),
+        response.headers.get("Location"),
+        response.mimetype,
+        fingerprint,
+    )
+
+
+def _replay(stored):
+    response = Response(stored.body, status=stored.status, mimetype=stored.mimetype)
+    if stored.location:
+        response.headers["Location"] = stored.location
+    return response
+
+
+def idempotent(f):
+    """Idempotency-Key 헤더나 idempotency_key 폼 값이 같은 요청은 한 번만 처리
+
+    키는 (세션 사용자, 요청 경로, 키) 단위로 구분한다. 같은 키가 동시에 들어오면
+    나중 요청은 처음 요청이 끝나기를 기다려 같은 결과를 받고, 이후 재전송은 저장된
+    결과를 DB 조회 없이 돌려준다. 저장하는 것은 성공/리다이렉트(2xx/3xx) 결과뿐이라
+    입력 오류(4xx)는 고쳐서 같은 키로 다시 보낼 수 있다. 같은 키를 폼 내용이 다른
+    요청에 다시 쓰면 422 로 거절한다. login_required 보다 바깥에 둔다.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get("Idempotency-Key") or request.form.get("idempotency_key")
+        if not key:
+            return f(*args, **kwargs)
+
+        scope = (session.get("_user_id"), request.path, key)
+        fingerprint = _fingerprint()
+        store = current_app.extensions["idempotency_store"]
+
+        stored = store.get(scope)
+        if stored is None:
+            def run():
+                response = make_response(f(*args, **kwargs))
+                stored = _snapshot(response, fingerprint)
+                if response.status_code < 400:
+                    store.set(scope, stored)
+                return stored, response
+
+            (stored, response), shared = flight.do(scope, run)
+            if not shared:
+                return response
+
+        if stored.fingerprint != fingerprint:
+            return "같은 Idempotency-Key 가 다른 요청에 사용되었습니다.", 422
+        replays.inc()
+        return _replay(stored)
+    return wrapper
+
+
+def init_idempotency(app):
+    app.extensions["idempotency_store"] = IdempotencyStore(
+        app.config.get("IDEMPOTENCY_TTL", 600),
+        app.config.get("IDEMPOTENCY_MAX_KEYS", 10000),
+    )
+
+    # 템플릿에서 폼마다 새 키 생성: {{ idempotency_key() }}
+    @app.context_processor
+    def idempotency_helpers():
+        return {"idempotency_key": lambda: uuid.uuid4().hex}
@@ -0,0 +1,247 @@
+# app/metrics.py
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 요청 지연 시간 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shards:
+    """스레드별 값 저장소
+
+    기록은 자기 스레드의 dict 만 고치므로 락이 필요 없고, 락은 새 스레드가 처음
+    기록할 때와 수집할 때만 잡는다. 종료된 스레드의 값은 retired 로 합쳐 둔다.
+    """
+
+    def __init__(self, merge):
+        self._merge = merge
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []  # (thread, dict)
+        self._retired = {}
+
+    def local(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead(self):
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge(self._retired, shard)
+        self._shards = alive
+
+    def collect(self):
+        with self._lock:
+            self._retire_dead()
+            total = {}
+            self._merge(total, self._retired)
+            for _, shard in self._shards:
+                self._merge(total, shard.copy())
+        return total
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+# ------------------- Counter -------------------
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._shards = _Shards(self._merge)
+
+    @staticmethod
+    def _merge(target, source):
+        for key, value in source.items():
+            target[key] = target.get(key, 0) + value
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        shard = self._shards.local()
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        return self._shards.collect().get(key, 0)
+
+    def render(self):
+        values = self._shards.collect()
+        if not values and not self.labelnames:
+            values = {(): 0}
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+# ------------------- Histogram -------------------
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards(self._merge)
+
+    @staticmethod
+    def _merge(target, source):
+        # 값: [버킷별 개수..., +Inf 개수, 합계]
+        for key, value in source.items():
+            current = target.get(key)
+            if current is None:
+                target[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    current[i] += v
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        shard = self._shards.local()
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render(self):
+        for key, counts in sorted(self._shards.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {counts[-1]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+# ------------------- Registry -------------------
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn):
+        """수집 시점에 값을 읽는 함수 등록. fn() 은 (이름, 종류, 설명, 값) 목록을 반환"""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for fn in self._collectors:
+            for name, kind, help, value in fn():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_latency = registry.histogram(
+    "http_request_duration_seconds", "라우트별 요청 처리 시간", ("endpoint", "method")
+)
+requests_total = registry.counter(
+    "http_requests_total", "라우트별 요청 수", ("endpoint", "method", "status")
+)
+leave_approvals = registry.counter("leave_approvals_total", "승인된 휴가 수")
+leave_rejections = registry.counter("leave_rejections_total", "반려된 휴가 수")
+balance_shortfalls = registry.counter(
+    "leave_balance_shortfalls_total", "연차가 부족하여 승인하지 못한 횟수"
+)
+overlap_rejections = registry.counter(
+    "leave_overlap_rejections_total", "기간이 겹쳐 거절된 휴가 신청 수"
+)
+db_queries = registry.counter("db_queries_total", "실행된 DB 쿼리 수")
+
+# 캘린더 API (/api/leaves) 합쳐진 요청 / 캐시 적중 / 요청 제한 통계
+calendar_requests = registry.counter("calendar_api_requests_total", "캘린더 API 요청 수")
+calendar_cache_hits = registry.counter("calendar_api_cache_hits_total", "캐시에서 응답한 캘린더 API 요청 수")
+calendar_coalesced = registry.counter("calendar_api_coalesced_total", "진행 중인 조회 결과를 함께 받은 캘린더 API 요청 수")
+calendar_computed = registry.counter("calendar_api_computed_total", "DB 를 조회한 캘린더 API 요청 수")
+calendar_throttled = registry.counter("calendar_api_throttled_total", "요청 제한으로 거절된 캘린더 API 요청 수")
+
+# 신청 가능 연차 프로젝션 읽기 / 재계산 워커 통계
+requestable_projection_reads = registry.counter(
+    "requestable_projection_reads_total", "프로젝션으로 처리한 신청 가능 연차 조회 수"
+)
+requestable_stale_reads = registry.counter(
+    "requestable_stale_reads_total", "재계산 대기 중이라 직접 계산한 조회 수"
+)
+requestable_processed_users = registry.counter("requestable_processed_users_total", "재계산한 직원 수")
+requestable_batches = registry.counter("requestable_batches_total", "처리한 재계산 묶음 수")
+requestable_failed_batches = registry.counter("requestable_failed_batches_total", "실패한 재계산 묶음 수")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    db_queries.inc()
+
+
+def init_metrics(app):
+    """모든 라우트의 처리 시간과 응답 코드를 기록
+
+    처리되지 않은 예외로 after_request 를 건너뛰는 요청도 남도록 teardown 에서 기록하고,
+    응답 코드는 after_request 에서 받아 둔다 (없으면 500).
+    """
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def remember_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request(exc):
+        started = g.pop("metrics_started", None)
+        status = g.pop("metrics_status", 500)
+        if started is not None and request.endpoint:
+            if exc is not None:
+                status = 500
+            elapsed = time.perf_counter() - started
+            request_latency.observe(elapsed, endpoint=request.endpoint, method=request.method)
+            requests_total.inc(endpoint=request.endpoint, method=request.method, status=status)
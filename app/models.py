@@ -3,6 +3,61 @@ from .extensions import db
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import date, timedelta
+from .allocation import allocate, balances_for_use
+
+
+# ------------------- 연차 계산 헬퍼 -------------------
+def count_leave_days(start_date, end_date, half_day=False):
+    """주말을 제외한 휴가 일수 (반차는 0.5일 차감)"""
+    # 날짜 역전 방지
+    if end_date < start_date:
+        return 0
+
+    total_days = 0
+    current = start_date
+
+    while current <= end_date:
+        # weekday(): 월=0 ~ 일=6 → 0~4만 평일
+        if current.weekday() < 5:
+            total_days += 1
+        current += timedelta(days=1)
+
+    # 반차 처리 (평일이 있을 때만 의미 있음)
+    if half_day and total_days > 0:
+        total_days -= 0.5
+
+    return max(total_days, 0)
+
+
+def expired_years(balances, as_of=None):
+    """만료일(expires_on)이 as_of(기본값: 오늘) 이전인 연도 집합"""
+    as_of = as_of or date.today()
+    return {b.year for b in balances if b.expires_on is not None and b.expires_on < as_of}
+
+
+def requestable_from(balances, pending_leaves, as_of=None):
+    """연도별 연차에서 Pending 휴가를 이전 연도부터 차감한 신청 가능 연차
+
+    balances: YearBalance 목록 (사용 가능 일수 기준)
+    pending_leaves: (start_date, days) 목록 (시작일 오름차순)
+    as_of 기준으로 이미 만료된 이월 연차는 제외한다 (기본값: 오늘).
+    """
+    remaining = allocate(balances, pending_leaves).remaining
+    expired = expired_years(balances, as_of)
+    return {year: round(days, 1) for year, days in remaining.items() if days > 0 and year not in expired}
+
+
+# ------------------- Department -------------------
+class Department(db.Model):
+    """부서 트리. path 는 루트부터의 id 경로 ("/1/4/9/") 로, 하위 부서 조회를 인덱스 범위 검색 한 번으로 처리"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    parent_id = db.Column(db.Integer, db.ForeignKey("department.id"), nullable=True)
+    path = db.Column(db.String(255), nullable=False, default="", index=True)
+
+    parent = db.relationship("Department", remote_side=[id], backref="children")
+    users = db.relationship("User", backref="department", lazy=True)
+
 
 # ------------------- User -------------------
 class User(db.Model, UserMixin):
@@ -11,6 +66,8 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(100), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), default="user")
+    hire_date = db.Column(db.Date, nullable=True)  # 입사일 (연차 자동 발생 기준)
+    department_id = db.Column(db.Integer, db.ForeignKey("department.id"), nullable=True, index=True)
 
     # 관계 정의
     leaves = db.relationship(
@@ -24,6 +81,19 @@ class User(db.Model, UserMixin):
         back_populates="user",
         cascade="all, delete-orphan"
     )
+    # 신청 가능 연차 프로젝션 (백그라운드 재계산 결과)
+    requestable_projection = db.relationship(
+        "RequestableDays",
+        lazy=True,
+        cascade="all, delete-orphan"
+    )
+    # 재계산 대기 표시 (있으면 프로젝션이 오래된 상태)
+    dirty_marker = db.relationship(
+        "DirtyUser",
+        uselist=False,
+        lazy=True,
+        cascade="all, delete-orphan"
+    )
 
     # 비밀번호 헬퍼
     def set_password(self, password):
@@ -54,37 +124,31 @@ class User(db.Model, UserMixin):
         return result
 
     # 신청 가능한 연차 (Pending 휴가 반영)
+    # 프로젝션이 최신이면 그대로 사용하고, 오래된 경우에만 직접 계산
     @property
     def requestable_leave_by_year(self):
-        result = {}
-        balances = sorted(self.leave_balances, key=lambda b: b.year)
-        available_by_year = {b.year: (b.total_days or 0.0) - (b.used_days or 0.0) for b in balances}
+        from .projections import read_requestable
+        return read_requestable(self)
 
+    def compute_requestable_leave_by_year(self):
         pending_leaves = sorted(
             [l for l in self.leaves if l.status == "Pending"],
             key=lambda l: l.start_date
         )
 
-        for leave in pending_leaves:
-            remaining = leave.days
-            for year in available_by_year:
-                if year > leave.start_date.year:
-                    continue
-                if remaining <= 0:
-                    break
-                deduct = min(available_by_year[year], remaining)
-                available_by_year[year] -= deduct
-                remaining -= deduct
-
-        for year, days in available_by_year.items():
-            if days > 0:
-                result[year] = round(days, 1)
-
-        return result
+        return requestable_from(
+            balances_for_use(self.leave_balances),
+            [(l.start_date, l.days) for l in pending_leaves]
+        )
 
 
 # ------------------- Leave -------------------
 class Leave(db.Model):
+    __table_args__ = (
+        db.Index("ix_leave_user_id_start_date", "user_id", "start_date"),
+        db.Index("ix_leave_status", "status"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
@@ -95,60 +159,74 @@ class Leave(db.Model):
 
     @property
     def days(self):
-        # 날짜 역전 방지
-        if self.end_date < self.start_date:
-            return 0
-
-        total_days = 0
-        current = self.start_date
-
-        while current <= self.end_date:
-            # weekday(): 월=0 ~ 일=6 → 0~4만 평일
-            if current.weekday() < 5:
-                total_days += 1
-            current += timedelta(days=1)
-
-        # 반차 처리 (평일이 있을 때만 의미 있음)
-        if self.half_day and total_days > 0:
-            total_days -= 0.5
-
-        return max(total_days, 0)
+        return count_leave_days(self.start_date, self.end_date, self.half_day)
 
 
     @property
     def pending_days_by_year(self):
-        """Pending 상태일 때 이전 연도부터 차감 예상일 계산"""
+        """Pending 상태일 때 이전 연도부터 차감 예상일 계산 (먼저 시작하는 Pending 휴가 반영)"""
         if self.status != "Pending":
             return {}
 
-        remaining_to_use = self.days
-        result = {}
+        balances = LeaveBalance.query.filter(
+            LeaveBalance.user_id == self.user_id,
+            LeaveBalance.year <= self.start_date.year
+        ).all()
 
-        # 이전 연도 먼저, 올해 순으로 차감
-        start_year = self.start_date.year
-        years = [start_year - 1, start_year]
-        for year in years:
-            balance = LeaveBalance.query.filter_by(user_id=self.user_id, year=year).first()
-            if balance:
-                used = balance.used_days or 0.0
-                available = balance.total_days - used
-                deduct = min(available, remaining_to_use)
-                if deduct > 0:
-                    result[year] = deduct
-                    remaining_to_use -= deduct
-            if remaining_to_use <= 0:
-                break
+        others = Leave.query.filter(
+            Leave.user_id == self.user_id,
+            Leave.status == "Pending",
+            Leave.id != self.id
+        ).all()
+        pending = sorted(others + [self], key=lambda l: (l.start_date, l.id or 0))
 
-        return result
+        allocation = allocate(balances_for_use(balances), [(l.start_date, l.days) for l in pending])
+        return allocation.deductions[pending.index(self)]
 
 
 # ------------------- LeaveBalance -------------------
 class LeaveBalance(db.Model):
+    __table_args__ = (db.UniqueConstraint("user_id", "year", name="uq_leave_balance_user_year"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     year = db.Column(db.Integer, nullable=False)
     total_days = db.Column(db.Float, default=15.0)
     used_days = db.Column(db.Float, default=0.0)
     pending_days = db.Column(db.Float, default=0.0)
+    # 이월 연차 만료일 (이후 시작하는 휴가에는 이 연도 연차를 쓸 수 없음)
+    expires_on = db.Column(db.Date, nullable=True)
 
     user = db.relationship("User", back_populates="leave_balances")
+
+
+# ------------------- RequestableDays -------------------
+class RequestableDays(db.Model):
+    """직원·연도별 신청 가능 연차 프로젝션 (백그라운드 워커가 갱신)"""
+    __tablename__ = "requestable_days"
+    __table_args__ = (db.UniqueConstraint("user_id", "year", name="uq_requestable_days_user_year"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    year = db.Column(db.Integer, nullable=False)
+    days = db.Column(db.Float, nullable=False, default=0.0)
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+
+# ------------------- DirtyUser -------------------
+class DirtyUser(db.Model):
+    """신청 가능 연차 재계산 대기열 (휴가/연차 변경 시 추가)"""
+    __tablename__ = "dirty_user"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    marked_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+# ------------------- AccrualRun -------------------
+class AccrualRun(db.Model):
+    """연차 일괄 발생 실행 기록 (기간별 1건, 중복 실행 방지)"""
+    __tablename__ = "accrual_run"
+
+    period = db.Column(db.String(7), primary_key=True)  # YYYY-MM
+    users = db.Column(db.Integer, nullable=False, default=0)
+    ran_at = db.Column(db.DateTime, nullable=False)
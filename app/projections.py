@@ -0,0 +1,262 @@
+# app/projections.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain, groupby
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, literal, select
+
+from .extensions import db
+from . import metrics
+from .metrics import registry
+from .models import User, Leave, LeaveBalance, RequestableDays, DirtyUser, count_leave_days, expired_years, requestable_from
+from .allocation import balances_for_use
+
+logger = logging.getLogger(__name__)
+
+# 마지막 재계산 묶음 처리 시각 (값을 바꿔 끼우기만 하므로 락 불필요)
+last_batch = {"at": None}
+
+
+# ------------------- 읽기 -------------------
+def read_requestable(user):
+    """프로젝션이 최신이면 프로젝션을, 재계산 대기 중이면 직접 계산한 값을 반환"""
+    if user.dirty_marker is None:
+        metrics.requestable_projection_reads.inc()
+        # 프로젝션 계산 후에 만료된 이월 연차는 읽을 때 제외
+        expired = expired_years(user.leave_balances)
+        rows = sorted(user.requestable_projection, key=lambda r: r.year)
+        return {r.year: r.days for r in rows if r.days > 0 and r.year not in expired}
+
+    metrics.requestable_stale_reads.inc()
+    return user.compute_requestable_leave_by_year()
+
+
+# ------------------- 대기열 적재 -------------------
+@event.listens_for(db.session, "before_flush")
+def mark_dirty_users(session, flush_context, instances):
+    """휴가/연차가 바뀐 직원을 같은 트랜잭션 안에서 재계산 대기열에 추가"""
+    user_ids = set()
+    deleted_user_ids = {o.id for o in session.deleted if isinstance(o, User)}
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, (Leave, LeaveBalance)):
+            continue
+        if obj.user_id:
+            user_ids.add(obj.user_id)
+        # 다른 직원으로 옮겨진 휴가는 이전 직원도 다시 계산
+        history = inspect(obj).attrs.user_id.history
+        user_ids.update(uid for uid in history.deleted if uid)
+
+    now = datetime.now()
+    for user_id in user_ids - deleted_user_ids:
+        marker = session.get(DirtyUser, user_id)
+        if marker:
+            marker.marked_at = now
+        else:
+            session.add(DirtyUser(user_id=user_id, marked_at=now))
+
+
+def mark_all_users_dirty():
+    """모든 직원을 재계산 대기열에 추가 (초기 적재 / 전체 재계산용)"""
+    now = datetime.now()
+    db.session.execute(delete(DirtyUser))
+    db.session.execute(
+        insert(DirtyUser).from_select(
+            ["user_id", "marked_at"],
+            select(User.id, literal(now, db.DateTime)),
+        )
+    )
+    db.session.commit()
+
+
+# ------------------- 재계산 -------------------
+def recompute_users(user_ids):
+    """주어진 직원들의 신청 가능 연차를 한 번에 계산해 프로젝션을 교체"""
+    balances = db.session.execute(
+        select(
+            LeaveBalance.user_id, LeaveBalance.year, LeaveBalance.total_days,
+            LeaveBalance.used_days, LeaveBalance.expires_on,
+        )
+        .where(LeaveBalance.user_id.in_(user_ids))
+        .order_by(LeaveBalance.user_id, LeaveBalance.year)
+    ).all()
+    pending = db.session.execute(
+        select(Leave.user_id, Leave.start_date, Leave.end_date, Leave.half_day)
+        .where(Leave.user_id.in_(user_ids), Leave.status == "Pending")
+        .order_by(Leave.user_id, Leave.start_date)
+    ).all()
+
+    pending_by_user = {
+        user_id: [(l.start_date, count_leave_days(l.start_date, l.end_date, l.half_day)) for l in rows]
+        for user_id, rows in groupby(pending, key=lambda row: row.user_id)
+    }
+
+    now = datetime.now()
+    projection = []
+    for user_id, rows in groupby(balances, key=lambda row: row.user_id):
+        requestable = requestable_from(balances_for_use(rows), pending_by_user.get(user_id, []))
+        projection.extend(
+            {"user_id": user_id, "year": year, "days": days, "computed_at": now}
+            for year, days in requestable.items()
+        )
+
+    db.session.execute(delete(RequestableDays).where(RequestableDays.user_id.in_(user_ids)))
+    if projection:
+        db.session.execute(insert(RequestableDays), projection)
+
+
+def process_batch(batch):
+    """(user_id, marked_at) 묶음을 재계산하고 그 사이 다시 표시되지 않은 대기 항목만 제거"""
+    recompute_users([user_id for user_id, _ in batch])
+
+    table = DirtyUser.__table__
+    db.session.execute(
+        table.delete().where(
+            table.c.user_id == bindparam("uid"),
+            table.c.marked_at <= bindparam("ts"),
+        ),
+        [{"uid": user_id, "ts": marked_at} for user_id, marked_at in batch],
+    )
+    db.session.commit()
+
+    metrics.requestable_processed_users.inc(len(batch))
+    metrics.requestable_batches.inc()
+    last_batch["at"] = datetime.now()
+
+
+# ------------------- 워커 -------------------
+class RequestableWorker:
+    """대기열을 주기적으로 읽어 스레드 풀에서 묶음 단위로 재계산하는 워커"""
+
+    def __init__(self, app, max_workers=4, batch_size=200, interval=2.0):
+        self.app = app
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.interval = interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="requestable")
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="requestable-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def run_once(self):
+        """대기 중인 직원을 한 번 처리하고 처리한 인원 수를 반환"""
+        with self.app.app_context():
+            dirty = db.session.execute(
+                select(DirtyUser.user_id, DirtyUser.marked_at)
+                .order_by(DirtyUser.marked_at)
+                .limit(self.batch_size * self.max_workers)
+            ).all()
+            db.session.remove()
+
+        batches = [dirty[i:i + self.batch_size] for i in range(0, len(dirty), self.batch_size)]
+        return sum(self._executor.map(self._run_batch, batches))
+
+    def _run_batch(self, batch):
+        with self.app.app_context():
+            try:
+                process_batch([tuple(row) for row in batch])
+                return len(batch)
+            except Exception:
+                db.session.rollback()
+                metrics.requestable_failed_batches.inc()
+                logger.exception("신청 가능 연차 재계산 실패")
+                return 0
+            finally:
+                db.session.remove()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("재계산 대기열 조회 실패")
+                processed = 0
+            # 처리할 것이 남아 있으면 바로 다음 묶음 진행
+            if processed < self.batch_size * self.max_workers:
+                self._stop.wait(self.interval)
+
+
+def start_requestable_worker(app):
+    config = app.config
+    worker = RequestableWorker(
+        app,
+        max_workers=config.get("REQUESTABLE_WORKER_THREADS", 4),
+        batch_size=config.get("REQUESTABLE_WORKER_BATCH_SIZE", 200),
+        interval=config.get("REQUESTABLE_WORKER_INTERVAL", 2.0),
+    )
+    worker.start()
+    app.extensions["requestable_worker"] = worker
+    return worker
+
+
+# ------------------- 상태 -------------------
+def staleness_metrics():
+    """대기열 길이, 가장 오래된 대기 시간, 읽기/처리 통계"""
+    depth, oldest = db.session.execute(
+        select(func.count(DirtyUser.user_id), func.min(DirtyUser.marked_at))
+    ).one()
+
+    return {
+        "queue_depth": depth,
+        "oldest_dirty_age_seconds": (datetime.now() - oldest).total_seconds() if oldest else 0.0,
+        "projection_reads": metrics.requestable_projection_reads.value(),
+        "stale_reads": metrics.requestable_stale_reads.value(),
+        "processed_users": metrics.requestable_processed_users.value(),
+        "batches": metrics.requestable_batches.value(),
+        "failed_batches": metrics.requestable_failed_batches.value(),
+        "last_batch_at": last_batch["at"],
+    }
+
+
+# ------------------- CLI -------------------
+@click.command("recompute-requestable")
+@click.option("--all", "all_users", is_flag=True, help="모든 직원을 대기열에 추가한 뒤 처리")
+@click.option("--threads", type=int, default=4)
+@click.option("--batch-size", type=int, default=200)
+@with_appcontext
+def recompute_requestable_command(all_users, threads, batch_size):
+    """재계산 대기열을 모두 비울 때까지 신청 가능 연차 프로젝션을 갱신"""
+    if all_users:
+        mark_all_users_dirty()
+
+    worker = RequestableWorker(current_app._get_current_object(), max_workers=threads, batch_size=batch_size)
+    started = time.perf_counter()
+    total = 0
+    while True:
+        processed = worker.run_once()
+        total += processed
+        if processed == 0:
+            break
+    worker.stop()
+    click.echo(f"{total}명 재계산 완료 ({time.perf_counter() - started:.2f}s)")
+
+
+@registry.collector
+def projection_metrics():
+    status = staleness_metrics()
+    return [
+        ("requestable_queue_depth", "gauge", "재계산 대기 중인 직원 수", status["queue_depth"]),
+        ("requestable_oldest_dirty_age_seconds", "gauge", "가장 오래 기다린 재계산 대기 시간", status["oldest_dirty_age_seconds"]),
+    ]
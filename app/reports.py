@@ -0,0 +1,167 @@
+# app/reports.py
+import csv
+import io
+import json
+from itertools import groupby
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select
+
+from .extensions import db
+from .models import User, Leave, LeaveBalance, count_leave_days
+from .allocation import allocate, balances_for_use
+
+# 한 번에 DB 에서 가져오는 행 수 (서버 사이드 커서)
+CHUNK_SIZE = 1000
+
+USAGE_FIELDS = ["user_id", "name", "email", "year", "total_days", "used_days", "pending_days", "remaining_days"]
+DETAIL_FIELDS = ["leave_id", "user_id", "name", "email", "start_date", "end_date", "half_day", "status", "days", "reason"]
+
+
+# ------------------- 연도별 사용 현황 -------------------
+def iter_usage_rows(year=None, chunk_size=CHUNK_SIZE):
+    """직원별·연도별 총/사용/Pending/남은 연차를 한 행씩 생성
+
+    연차(LeaveBalance)와 Pending 휴가를 각각 user_id 순으로 스트리밍한 뒤
+    직원 단위로 병합하므로 회사 규모와 상관없이 메모리 사용량이 일정하다.
+    """
+    balances = db.session.execute(
+        select(
+            LeaveBalance.user_id, User.name, User.email,
+            LeaveBalance.year, LeaveBalance.total_days, LeaveBalance.used_days, LeaveBalance.expires_on,
+        )
+        .join(User, User.id == LeaveBalance.user_id)
+        .order_by(LeaveBalance.user_id, LeaveBalance.year)
+        .execution_options(yield_per=chunk_size)
+    )
+    pending = db.session.execute(
+        select(Leave.user_id, Leave.start_date, Leave.end_date, Leave.half_day)
+        .where(Leave.status == "Pending")
+        .order_by(Leave.user_id, Leave.start_date)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    pending_groups = groupby(pending, key=lambda row: row.user_id)
+    pending_user_id, pending_rows = next(pending_groups, (None, iter(())))
+
+    for user_id, rows in groupby(balances, key=lambda row: row.user_id):
+        rows = list(rows)
+
+        # 이 직원보다 앞선 Pending 그룹은 연차가 없는 직원이므로 건너뜀
+        while pending_user_id is not None and pending_user_id < user_id:
+            pending_user_id, pending_rows = next(pending_groups, (None, iter(())))
+
+        leaves = []
+        if pending_user_id == user_id:
+            leaves = [
+                (l.start_date, count_leave_days(l.start_date, l.end_date, l.half_day))
+                for l in pending_rows
+            ]
+
+        # Pending 휴가가 연도별로 차감될 예상 일수
+        pending_by_year = {}
+        for deduction in allocate(balances_for_use(rows), leaves).deductions:
+            for y, days in deduction.items():
+                pending_by_year[y] = pending_by_year.get(y, 0.0) + days
+
+        for r in rows:
+            if year is not None and r.year != year:
+                continue
+            remaining = (r.total_days or 0.0) - (r.used_days or 0.0)
+            yield {
+                "user_id": user_id,
+                "name": r.name,
+                "email": r.email,
+                "year": r.year,
+                "total_days": r.total_days or 0.0,
+                "used_days": r.used_days or 0.0,
+                "pending_days": round(pending_by_year.get(r.year, 0.0), 1),
+                "remaining_days": round(remaining, 1),
+            }
+
+
+# ------------------- 휴가 상세 -------------------
+def iter_leave_rows(year=None, chunk_size=CHUNK_SIZE):
+    """휴가 한 건당 한 행씩 생성"""
+    query = (
+        select(
+            Leave.id, Leave.user_id, User.name, User.email, Leave.start_date,
+            Leave.end_date, Leave.half_day, Leave.status, Leave.reason,
+        )
+        .join(User, User.id == Leave.user_id)
+        .order_by(Leave.user_id, Leave.start_date)
+        .execution_options(yield_per=chunk_size)
+    )
+    if year is not None:
+        query = query.where(db.extract("year", Leave.start_date) == year)
+
+    for r in db.session.execute(query):
+        yield {
+            "leave_id": r.id,
+            "user_id": r.user_id,
+            "name": r.name,
+            "email": r.email,
+            "start_date": r.start_date.isoformat(),
+            "end_date": r.end_date.isoformat(),
+            "half_day": bool(r.half_day),
+            "status": r.status,
+            "days": count_leave_days(r.start_date, r.end_date, r.half_day),
+            "reason": r.reason or "",
+        }
+
+
+# ------------------- 포맷 변환 -------------------
+def iter_csv(rows, fields, chunk_size=CHUNK_SIZE):
+    """행을 CSV 텍스트 덩어리로 변환 (chunk_size 행마다 한 번 yield)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(rows, chunk_size=CHUNK_SIZE):
+    """행을 JSON Lines 텍스트 덩어리로 변환"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_report(fmt="csv", detail=False, year=None):
+    """리포트 종류(detail)와 포맷(csv/jsonl)에 맞는 텍스트 스트림"""
+    if detail:
+        rows, fields = iter_leave_rows(year), DETAIL_FIELDS
+    else:
+        rows, fields = iter_usage_rows(year), USAGE_FIELDS
+
+    if fmt == "jsonl":
+        return iter_jsonl(rows)
+    return iter_csv(rows, fields)
+
+
+# ------------------- CLI -------------------
+@click.command("usage-report")
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default="csv")
+@click.option("--detail", is_flag=True, help="휴가 건별 상세 출력")
+@click.option("--year", type=int, default=None, help="특정 연도만 출력")
+@click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-")
+@with_appcontext
+def usage_report_command(fmt, detail, year, output):
+    """연도별 연차 사용 현황 리포트를 CSV / JSON Lines 로 출력"""
+    for chunk in iter_report(fmt, detail, year):
+        output.write(chunk)
@@ -1,13 +1,21 @@
 # app/routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, abort, flash
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, abort, flash, Response, stream_with_context, current_app
 from datetime import datetime, timedelta
 from .extensions import db
-from .models import User, Leave, LeaveBalance
+from .models import User, Leave, LeaveBalance, Department
+from .reports import iter_report
+from .allocation import allocate, balances_for_use, balances_for_release
+from .projections import staleness_metrics
+from .throttle import SingleFlight
+from .idempotency import idempotent
+from . import metrics
+from .hierarchy import scope_condition, is_manager, can_manage, calendar_scope, subtree_user_ids
 from flask_login import login_user, logout_user, login_required, current_user
 from functools import wraps
 from werkzeug.security import check_password_hash
 from datetime import date, datetime
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+import math
 
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -30,6 +38,7 @@ def login():
 
 
 bp = Blueprint("main", __name__)
+calendar_flight = SingleFlight()
 
 def admin_required(f):
     @wraps(f)
@@ -39,6 +48,15 @@ def admin_required(f):
         return f(*args, **kwargs)
     return wrapper
 
+def approver_required(f):
+    """관리자 또는 부서 매니저만 허용"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if current_user.role != "admin" and not is_manager(current_user):
+            abort(403)
+        return f(*args, **kwargs)
+    return wrapper
+
 @bp.route("/")
 def index():
     return render_template("index.html")
@@ -58,8 +76,13 @@ def logout():
 @bp.route("/users")
 @login_required
 def user_list():
-    if current_user.role == "admin":
-        users = User.query.options(joinedload(User.leave_balances)).all()
+    # 관리자는 전체, 매니저는 담당 하위 부서 직원
+    if current_user.role == "admin" or is_manager(current_user):
+        users = User.query.options(
+            selectinload(User.leave_balances),
+            selectinload(User.requestable_projection),
+            joinedload(User.dirty_marker),
+        ).filter(scope_condition(current_user, User.id)).all()
     else:
         users = [current_user]
 
@@ -77,10 +100,13 @@ def add_user():
             flash("이미 존재하는 이메일입니다.")
             return redirect(url_for("main.add_user"))
 
+        hire_date = request.form.get("hire_date")
         user = User(
             name=request.form["name"],
             email=request.form["email"],
-            role=request.form.get("role", "user")
+            role=request.form.get("role", "user"),
+            hire_date=datetime.strptime(hire_date, "%Y-%m-%d").date() if hire_date else None,
+            department_id=request.form.get("department_id", type=int)
         )
 
         # 초기 비밀번호 세팅
@@ -91,7 +117,8 @@ def add_user():
         flash(f"{user.name} 계정이 생성되었습니다. 초기 비밀번호는 '12345'입니다.")
         return redirect(url_for("main.user_list"))
 
-    return render_template("add_user.html")
+    departments = Department.query.order_by(Department.path).all()
+    return render_template("add_user.html", departments=departments)
 
 
 # ------------------- 직원 삭제 -------------------
@@ -135,10 +162,14 @@ def change_password():
 @bp.route("/leaves")
 @login_required
 def leave_list():
-    if current_user.role == "admin":
-        leaves = Leave.query
-    else:
-        leaves = Leave.query.filter_by(user_id=current_user.id)
+    # 관리자: 전체, 매니저: 담당 하위 부서, 직원: 본인
+    # (화면에서 쓰는 직원별 연차 / 신청 가능 연차는 행마다 조회하지 않도록 한 번에 로드)
+    user = joinedload(Leave.user)
+    leaves = Leave.query.options(
+        user.selectinload(User.leave_balances),
+        user.selectinload(User.requestable_projection),
+        user.selectinload(User.dirty_marker),
+    ).filter(scope_condition(current_user, Leave.user_id))
 
     today = date.today()
 
@@ -173,11 +204,16 @@ def add_leave_balance():
         user_id = int(request.form["user_id"])
         year = int(request.form["year"])
         total_days = float(request.form["total_days"])
+        expires_on = request.form.get("expires_on")
+        expires_on = datetime.strptime(expires_on, "%Y-%m-%d").date() if expires_on else None
         balance = LeaveBalance.query.filter_by(user_id=user_id, year=year).first()
         if balance:
             balance.total_days = total_days
+            # 만료일을 비워 두면 기존 값 유지, 지우려면 "만료일 없음" 선택
+            if expires_on or "clear_expires_on" in request.form:
+                balance.expires_on = expires_on
         else:
-            balance = LeaveBalance(user_id=user_id, year=year, total_days=total_days)
+            balance = LeaveBalance(user_id=user_id, year=year, total_days=total_days, expires_on=expires_on)
             db.session.add(balance)
         db.session.commit()
         return redirect(url_for("main.user_list"))
@@ -265,6 +301,7 @@ def edit_leave_balance(user_id):
 
 # ------------------- 휴가 신청 -------------------
 @bp.route("/leaves/add", methods=["GET", "POST"])
+@idempotent
 @login_required
 def add_leave():
     users = User.query.all() if current_user.role == "admin" else [current_user]
@@ -277,8 +314,8 @@ def add_leave():
 
         leave = Leave(
             user_id=user.id,
-            start_date=datetime.strptime(request.form["start_date"], "%Y-%m-%d"),
-            end_date=datetime.strptime(request.form["end_date"], "%Y-%m-%d"),
+            start_date=datetime.strptime(request.form["start_date"], "%Y-%m-%d").date(),
+            end_date=datetime.strptime(request.form["end_date"], "%Y-%m-%d").date(),
             half_day="half_day" in request.form,
             reason=request.form["reason"],
             status="Pending"
@@ -298,6 +335,7 @@ def add_leave():
         ).first()
 
         if overlapping_leave:
+            metrics.overlap_rejections.inc()
             flash("이미 해당 기간에 신청된 휴가가 있습니다.", "danger")
             return redirect(url_for("main.add_leave"))
 
@@ -322,57 +360,58 @@ def add_leave():
 
 # ------------------- 휴가 승인 -------------------
 @bp.route("/leaves/<int:leave_id>/approve", methods=["POST"])
+@idempotent
 @login_required
-@admin_required
+@approver_required
 def approve_leave(leave_id):
     leave = Leave.query.get_or_404(leave_id)
+    if not can_manage(current_user, leave.user):
+        abort(403)
     if leave.status != "Pending":
         return "이미 처리된 휴가입니다.", 400
 
-    user = leave.user
-    days_to_use = leave.days
-
-    # 🔥 이전 연도 먼저 차감, 사용일수 None 처리
+    # 🔥 이전 연도 먼저 차감 (만료된 이월 연차 제외)
     balances = (
         LeaveBalance.query
-        .filter(LeaveBalance.user_id == user.id, LeaveBalance.year <= leave.start_date.year)
+        .filter(LeaveBalance.user_id == leave.user_id, LeaveBalance.year <= leave.start_date.year)
         .order_by(LeaveBalance.year.asc())
         .all()
     )
 
-    remaining = days_to_use
-    for balance in balances:
-        balance.used_days = balance.used_days or 0.0
-        available = balance.total_days - balance.used_days
-        if available <= 0:
-            continue
-        deduct = min(available, remaining)
-        balance.used_days += deduct
-        remaining -= deduct
-        if remaining <= 0:
-            break
-
-    if remaining > 0:
+    allocation = allocate(balances_for_use(balances), [(leave.start_date, leave.days)])
+    if allocation.shortfalls[0] > 0:
+        metrics.balance_shortfalls.inc()
         return "연차가 부족하여 승인할 수 없습니다.", 400
 
+    balance_by_year = {b.year: b for b in balances}
+    for year, deduct in allocation.deductions[0].items():
+        balance = balance_by_year[year]
+        balance.used_days = (balance.used_days or 0.0) + deduct
+
     leave.status = "Approved"
     db.session.commit()
+    metrics.leave_approvals.inc()
     return redirect(url_for("main.leave_list"))
 
 # ------------------- 휴가 반려 -------------------
 @bp.route("/leaves/<int:leave_id>/reject", methods=["POST"])
+@idempotent
 @login_required
-@admin_required
+@approver_required
 def reject_leave(leave_id):
     leave = Leave.query.get_or_404(leave_id)
+    if not can_manage(current_user, leave.user):
+        abort(403)
     if leave.status != "Pending":
         return "이미 처리된 휴가입니다.", 400
     leave.status = "Rejected"
     db.session.commit()
+    metrics.leave_rejections.inc()
     return redirect(url_for("main.leave_list"))
 
 # ------------------- 휴가 삭제 -------------------
 @bp.route("/leaves/<int:leave_id>/delete", methods=["POST"])
+@idempotent
 @login_required
 def delete_leave(leave_id):
     leave = Leave.query.get_or_404(leave_id)
@@ -398,14 +437,11 @@ def delete_leave(leave_id):
             .all()
         )
 
-        remaining = leave.days
-        for balance in balances:
-            balance.used_days = balance.used_days or 0.0
-            deduct = min(balance.used_days, remaining)
-            balance.used_days -= deduct
-            remaining -= deduct
-            if remaining <= 0:
-                break
+        allocation = allocate(balances_for_release(balances), [(leave.start_date, leave.days)])
+        balance_by_year = {b.year: b for b in balances}
+        for year, restore in allocation.deductions[0].items():
+            balance = balance_by_year[year]
+            balance.used_days = (balance.used_days or 0.0) - restore
 
     db.session.delete(leave)
     db.session.commit()
@@ -478,15 +514,126 @@ def edit_leave(leave_id):
     )
 
 # ------------------- 캘린더 API -------------------
+def calendar_stats():
+    """합쳐진 요청 / 캐시 적중 / 요청 제한 통계"""
+    return {
+        "requests": metrics.calendar_requests.value(),
+        "cache_hits": metrics.calendar_cache_hits.value(),
+        "coalesced": metrics.calendar_coalesced.value(),
+        "computed": metrics.calendar_computed.value(),
+        "throttled": metrics.calendar_throttled.value(),
+    }
+
+
+def parse_calendar_day(value):
+    """캘린더 기간 파라미터 → date (없으면 None, 형식이 틀리면 ValueError). ASGI 앱과 함께 사용"""
+    # FullCalendar 는 "2026-09-28T00:00:00+09:00" 형태로 보냄
+    if not value:
+        return None
+    return date.fromisoformat(value[:10])
+
+
+def leave_event(leave_row):
+    color = "#f1c40f" if leave_row.status == "Pending" else "#2ecc71" if leave_row.status == "Approved" else "#e74c3c"
+    return {
+        "title": f"{leave_row.name} ({leave_row.status})",
+        "start": leave_row.start_date.isoformat(),
+        "end": (leave_row.end_date + timedelta(days=1)).isoformat(),
+        "color": color,
+    }
+
+
+def load_calendar_events(start, end, path=None, session=None):
+    """start <= 날짜 < end 기간과 겹치는 휴가 이벤트 목록 (기간이 없으면 전체, path 가 있으면 해당 부서 하위만)"""
+    query = (session or db.session).query(
+        Leave.start_date, Leave.end_date, Leave.status, User.name
+    ).join(User, User.id == Leave.user_id)
+    if path:
+        query = query.filter(Leave.user_id.in_(subtree_user_ids(path)))
+    if end:
+        query = query.filter(Leave.start_date < end)
+    if start:
+        query = query.filter(Leave.end_date >= start)
+    return [leave_event(row) for row in query]
+
+
 @bp.route("/api/leaves")
 def api_leaves():
-    events = []
-    for leave in Leave.query.all():
-        color = "#f1c40f" if leave.status == "Pending" else "#2ecc71" if leave.status == "Approved" else "#e74c3c"
-        events.append({
-            "title": f"{leave.user.name} ({leave.status})",
-            "start": leave.start_date.isoformat(),
-            "end": (leave.end_date + timedelta(days=1)).isoformat(),
-            "color": color,
-        })
+    metrics.calendar_requests.inc()
+
+    # 부서 범위로 나눠 보여주므로 비로그인 요청은 거절 (JSON API 라 로그인 화면으로 보내지 않음)
+    if not current_user.is_authenticated:
+        return jsonify({"error": "로그인이 필요합니다."}), 401
+
+    # 사용자별 요청 제한
+    allowed, retry_after = current_app.extensions["calendar_limiter"].allow(f"user:{current_user.id}")
+    if not allowed:
+        metrics.calendar_throttled.inc()
+        response = jsonify({"error": "요청이 너무 많습니다. 잠시 후 다시 시도하세요."})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(math.ceil(retry_after))
+        return response
+
+    try:
+        start, end = parse_calendar_day(request.args.get("start")), parse_calendar_day(request.args.get("end"))
+    except ValueError:
+        abort(400)
+    window = (start, end, calendar_scope(current_user))
+
+    cache = current_app.extensions["calendar_cache"]
+    events = cache.get(window)
+    if events is not None:
+        metrics.calendar_cache_hits.inc()
+        return jsonify(events)
+
+    # 같은 기간을 동시에 요청하면 한 번만 조회하고 결과를 공유
+    def compute():
+        metrics.calendar_computed.inc()
+        result = load_calendar_events(*window)
+        cache.set(window, result)
+        return result
+
+    events, shared = calendar_flight.do(window, compute)
+    if shared:
+        metrics.calendar_coalesced.inc()
     return jsonify(events)
+
+
+@bp.route("/api/leaves/stats")
+@login_required
+@admin_required
+def api_leaves_stats():
+    return jsonify(calendar_stats())
+
+# ------------------- 연차 사용 리포트 -------------------
+@bp.route("/reports/usage")
+@login_required
+@admin_required
+def usage_report():
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "jsonl"):
+        abort(400)
+    detail = request.args.get("detail") == "1"
+    year = request.args.get("year", type=int)
+
+    mimetype = "application/x-ndjson" if fmt == "jsonl" else "text/csv"
+    filename = f"leave_{'detail' if detail else 'usage'}{'_' + str(year) if year else ''}.{fmt}"
+    return Response(
+        stream_with_context(iter_report(fmt, detail, year)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+# ------------------- 신청 가능 연차 재계산 상태 -------------------
+@bp.route("/api/requestable/status")
+@login_required
+@admin_required
+def requestable_status():
+    return jsonify(staleness_metrics())
+
+
+# ------------------- 메트릭 -------------------
+@bp.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,143 @@
+# app/throttle.py
+import asyncio
+import threading
+import time
+
+
+# ------------------- 요청 합치기 (single-flight) -------------------
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 계산을 한 번만 실행하고 결과를 나눠 가짐"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """(결과, 다른 요청의 계산을 기다려 받았는지) 를 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """SingleFlight 의 asyncio 버전 (한 이벤트 루프 안에서만 사용)"""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """(결과, 다른 요청의 계산을 기다려 받았는지) 를 반환. fn 은 코루틴 함수"""
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+            if not future.done():  # 계산하던 요청이 취소된 경우
+                future.cancel()
+
+        return result, False
+
+
+# ------------------- 짧은 TTL 캐시 -------------------
+class TTLCache:
+    """키별로 ttl 초 동안만 유지되는 작은 캐시 (가득 차면 만료 항목부터 정리)"""
+
+    def __init__(self, ttl, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items = {}
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            return None
+        return value
+
+    def set(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._items) >= self.max_entries:
+                self._items = {k: v for k, v in self._items.items() if v[0] >= now}
+                if len(self._items) >= self.max_entries:
+                    self._items.clear()
+            self._items[key] = (now + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+# ------------------- 토큰 버킷 -------------------
+class TokenBucketLimiter:
+    """키(사용자)별 토큰 버킷. 초당 rate 개씩 최대 burst 개까지 충전"""
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def allow(self, key):
+        """(허용 여부, 다음 토큰까지 남은 초) 를 반환"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (1 - tokens) / self.rate
+
+            # 오래 쓰지 않아 가득 찬 버킷은 정리
+            if len(self._buckets) > self.max_keys:
+                self._buckets = {
+                    k: (t, u) for k, (t, u) in self._buckets.items()
+                    if t + (now - u) * self.rate < self.burst
+                }
+
+        return allowed, retry_after
@@ -0,0 +1,97 @@
+"""연차 일괄 발생(run_accrual) 벤치마크
+
+    python bench/accrual.py [--users 100000] [--period 2026-06]
+
+임시 DB 에 입사일이 다양한 직원을 만들고 다음을 차례로 실행해 시간을 잰다.
+  1. period 최초 실행
+  2. 같은 period 강제 재실행 (바뀌는 행 0건이어야 함)
+  3. 다음 달 실행
+마지막으로 모든 직원의 결과를 AccrualPolicy.days_for_year 와 비교한다.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from common import make_app
+
+
+def months_between(hire_date, as_of):
+    return (as_of.year - hire_date.year) * 12 + as_of.month - hire_date.month - (hire_date.day > as_of.day)
+
+
+def next_period(period):
+    year, month = (int(p) for p in period.split("-"))
+    return f"{year + month // 12}-{month % 12 + 1:02d}"
+
+
+def seed(users, seed=0):
+    """입사일이 최근 25년 사이에 고르게 분포한 직원 생성"""
+    from sqlalchemy import insert
+    from app.extensions import db
+    from app.models import User
+
+    rng = random.Random(seed)
+    first = date(2001, 1, 1)
+    span = (date(2026, 12, 31) - first).days
+    rows = [
+        {"name": f"u{i}", "email": f"u{i}@bench", "password_hash": "x", "role": "user",
+         "hire_date": first + timedelta(days=rng.randrange(span))}
+        for i in range(users)
+    ]
+    db.create_all()
+    db.session.execute(insert(User), rows)
+    db.session.commit()
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label}: {result} rows, {time.perf_counter() - started:.2f}s")
+
+
+def verify(policy, period):
+    from app.accrual import period_end
+    from app.extensions import db
+    from app.models import User, LeaveBalance
+
+    as_of = period_end(period)
+    year_end_before = date(as_of.year - 1, 12, 31)
+    recorded = dict(
+        db.session.query(LeaveBalance.user_id, LeaveBalance.total_days).filter(LeaveBalance.year == as_of.year)
+    )
+    mismatches = 0
+    for user_id, hire_date in db.session.query(User.id, User.hire_date):
+        if hire_date > as_of:
+            expected = None
+        else:
+            expected = policy.days_for_year(months_between(hire_date, as_of), months_between(hire_date, year_end_before))
+        mismatches += recorded.get(user_id) != expected
+    print(f"verify {period}: {mismatches} mismatches")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--period", default="2026-06")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context():
+            from app.accrual import AccrualPolicy, run_accrual
+
+            policy = AccrualPolicy.from_config(app.config["ACCRUAL_POLICY"])
+            seed(args.users)
+            following = next_period(args.period)
+
+            timed(f"{args.period} first run", lambda: run_accrual(args.period, policy))
+            timed(f"{args.period} forced re-run", lambda: run_accrual(args.period, policy, force=True))
+            timed(f"{following} run", lambda: run_accrual(following, policy))
+            verify(policy, following)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""이전 연도 우선 차감: 기존 이중 루프 vs allocate() 비교
+
+    python bench/allocation.py [--users 200] [--years 15] [--leaves 400]
+
+DB 없이 메모리에서 직원별 연차(years 년치)와 Pending 휴가(leaves 건)를 만들어
+두 방식으로 신청 가능 연차를 계산하고, 시간과 결과 일치 여부를 출력한다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.allocation import YearBalance, allocate  # noqa: E402
+
+
+def legacy_requestable(available_by_year, pending_leaves):
+    """allocate() 도입 전 requestable_from: 휴가마다 모든 연도를 처음부터 훑음"""
+    available_by_year = dict(available_by_year)
+
+    for start_date, days in pending_leaves:
+        remaining = days
+        for year in available_by_year:
+            if year > start_date.year:
+                continue
+            if remaining <= 0:
+                break
+            deduct = min(available_by_year[year], remaining)
+            available_by_year[year] -= deduct
+            remaining -= deduct
+
+    return {year: round(days, 1) for year, days in available_by_year.items() if days > 0}
+
+
+def make_users(users, years, leaves, seed=1):
+    rng = random.Random(seed)
+    last_year = 2026
+    first_year = last_year - years + 1
+    data = []
+    for _ in range(users):
+        balances = [
+            YearBalance(year, float(rng.randint(15, 25)), None)
+            for year in range(first_year, last_year + 1)
+        ]
+        starts = sorted(
+            date(first_year, 1, 1) + timedelta(days=rng.randrange(365 * years))
+            for _ in range(leaves)
+        )
+        data.append((balances, [(start, rng.choice((0.5, 1.0, 2.0))) for start in starts]))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--years", type=int, default=15)
+    parser.add_argument("--leaves", type=int, default=400)
+    args = parser.parse_args()
+
+    data = make_users(args.users, args.years, args.leaves)
+
+    started = time.perf_counter()
+    legacy = [legacy_requestable({b.year: b.available for b in balances}, leaves) for balances, leaves in data]
+    legacy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    current = [
+        {year: round(days, 1) for year, days in allocate(balances, leaves).remaining.items() if days > 0}
+        for balances, leaves in data
+    ]
+    current_elapsed = time.perf_counter() - started
+
+    print(f"{args.users} users x {args.years} years x {args.leaves} leaves")
+    print(f"legacy loop: {legacy_elapsed:.3f}s")
+    print(f"allocate():  {current_elapsed:.3f}s")
+    print(f"identical results: {legacy == current}")
+
+
+if __name__ == "__main__":
+    main()
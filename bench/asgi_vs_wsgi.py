@@ -0,0 +1,145 @@
+"""/api/leaves 동시 접속 벤치마크: Werkzeug 스레드 WSGI 서버 vs ASGI(uvicorn) 모드
+
+    python bench/asgi_vs_wsgi.py [--clients 500] [--rounds 2] [--users 200] [--leaves 10]
+
+임시 DB 에 직원과 승인 휴가를 만들고, 두 서버를 차례로 별도 프로세스로 띄운 뒤
+clients 개의 연결로 동시에 /api/leaves 를 요청한다. 캐시와 요청 제한은 끄고
+(매 요청 DB 조회) 라운드별 총 시간과 p50/p99 응답 시간을 출력한다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from common import make_app
+
+# 캐시/요청 제한 없이 매번 조회
+SERVER_CONFIG = {"CALENDAR_CACHE_TTL": 0, "CALENDAR_RATE_BURST": 10**9, "REQUESTABLE_WORKER_ENABLED": False}
+
+
+def seed(db_path, users, leaves_per_user):
+    """직원(users 명, 관리자 1명 포함)과 직원별 승인 휴가 생성 후 관리자 세션 쿠키 반환"""
+    from app.extensions import db
+    from app.models import User, Leave
+
+    app = make_app(db_path, **SERVER_CONFIG)
+    rng = random.Random(0)
+    with app.app_context():
+        db.create_all()
+        admin = User(name="admin", email="admin@bench", role="admin")
+        admin.set_password("bench")
+        db.session.add(admin)
+        db.session.add_all(User(name=f"u{i}", email=f"u{i}@bench", password_hash="x") for i in range(users - 1))
+        db.session.flush()
+        for user_id, in db.session.query(User.id):
+            for _ in range(leaves_per_user):
+                start = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+                db.session.add(Leave(user_id=user_id, start_date=start, end_date=start + timedelta(days=2), status="Approved"))
+        db.session.commit()
+
+    client = app.test_client()
+    client.post("/auth/login", data={"email": "admin@bench", "password": "bench"})
+    return client.get_cookie("session").value
+
+
+def serve(mode, db_path, port):
+    app = make_app(db_path, **SERVER_CONFIG)
+    if mode == "asgi":
+        import uvicorn
+        from app.asgi import create_asgi_app
+
+        uvicorn.run(create_asgi_app(app), host="127.0.0.1", port=port, log_level="warning", backlog=2048)
+    else:
+        from werkzeug.serving import run_simple
+
+        run_simple("127.0.0.1", port, app, threaded=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{port} 포트의 서버가 시작되지 않았습니다.")
+
+
+async def fetch(port, cookie, i):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((
+        f"GET /api/leaves?start=2026-{1 + i % 9:02d}-01&end=2026-{10 + i % 3}-01 HTTP/1.1\r\n"
+        f"Host: bench\r\nCookie: session={cookie}\r\nConnection: close\r\n\r\n"
+    ).encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return data.split(b" ", 2)[1], time.perf_counter()
+
+
+async def run_round(port, cookie, clients):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(fetch(port, cookie, i) for i in range(clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    latencies = sorted(r[1] - started for r in results if not isinstance(r, Exception) and r[0] == b"200")
+    return elapsed, latencies
+
+
+def bench(mode, db_path, cookie, clients, rounds):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", mode, "--db", db_path, "--port", str(port)],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        for n in range(1, rounds + 1):
+            elapsed, latencies = asyncio.run(run_round(port, cookie, clients))
+            if not latencies:
+                print(f"{mode} round {n}: 0/{clients} ok")
+                continue
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+            print(f"{mode} round {n}: {len(latencies)}/{clients} ok, total {elapsed:.2f}s, p50 {p50:.2f}s, p99 {p99:.2f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--leaves", type=int, default=10, help="직원별 승인 휴가 수")
+    parser.add_argument("--serve", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve, args.db, args.port)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        cookie = seed(db_path, args.users, args.leaves)
+        print(f"{args.users} users x {args.leaves} leaves, {args.clients} concurrent clients")
+        for mode in ("wsgi", "asgi"):
+            bench(mode, db_path, cookie, args.clients, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""벤치마크 스크립트 공용: 지정한 SQLite 파일을 쓰는 앱 생성"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+
+
+def make_app(db_path, **config):
+    """db_path 를 기본 DB 로 쓰는 앱 (config 로 Config 값을 덮어씀)"""
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.abspath(db_path)}"
+    Config.SQLALCHEMY_BINDS = {}
+    for key, value in config.items():
+        setattr(Config, key, value)
+    return create_app()
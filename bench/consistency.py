@@ -0,0 +1,105 @@
+"""연차 사용 일수 검증/복구(check-balances) 벤치마크
+
+    python bench/consistency.py [--users 100000] [--leaves 10] [--drift-every 10]
+
+임시 DB 에 직원별 2025/2026 연차와 승인 휴가(leaves 건)를 만들고, drift_every 명마다
+한 명의 2025 년 used_days 를 틀리게 기록한다. 검증만 한 번, 검증+복구 한 번 실행해
+시간과 Python 할당 최대치(tracemalloc, 시간 측정과 별도 실행)를 출력하고, 복구 후
+차이가 0건인지 확인한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from common import make_app
+
+INSERT_BATCH = 200_000
+
+
+def seed(users, leaves_per_user, drift_every):
+    """2025 년 3일 + 2026 년 15일, 2026 년 1일짜리 승인 휴가 leaves_per_user 건
+
+    이전 연도부터 차감하므로 기대 사용 일수는 2025 년 3일, 2026 년 (leaves_per_user - 3)일.
+    """
+    from sqlalchemy import insert
+    from app.extensions import db
+    from app.models import User, Leave, LeaveBalance
+
+    db.create_all()
+    db.session.execute(insert(User), [
+        {"id": i, "name": f"u{i}", "email": f"u{i}@bench", "password_hash": "x", "role": "user"}
+        for i in range(1, users + 1)
+    ])
+
+    balances, leaves = [], []
+    for i in range(1, users + 1):
+        balances.append({"user_id": i, "year": 2025, "total_days": 3.0, "used_days": 0.0 if i % drift_every == 0 else 3.0, "pending_days": 0.0})
+        balances.append({"user_id": i, "year": 2026, "total_days": 15.0, "used_days": leaves_per_user - 3.0, "pending_days": 0.0})
+        for k in range(leaves_per_user):
+            day = date(2026, 1, 5) + timedelta(days=7 * k)
+            leaves.append({"user_id": i, "start_date": day, "end_date": day, "status": "Approved", "half_day": False})
+        if len(leaves) >= INSERT_BATCH:
+            db.session.execute(insert(Leave), leaves)
+            leaves = []
+    if leaves:
+        db.session.execute(insert(Leave), leaves)
+    db.session.execute(insert(LeaveBalance), balances)
+    db.session.commit()
+
+
+def check(repair=False):
+    from app.consistency import iter_balance_drift, repair_balances
+    from app.extensions import db
+
+    summary = {}
+    rows = iter_balance_drift(summary)
+    if repair:
+        rows = repair_balances(rows)
+    for _ in rows:
+        pass
+    if repair:
+        db.session.commit()
+    else:
+        db.session.rollback()
+    return summary
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    summary = fn()
+    print(f"{label}: {time.perf_counter() - started:.2f}s {summary}")
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--leaves", type=int, default=10, help="직원별 승인 휴가 수 (3 이상)")
+    parser.add_argument("--drift-every", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context():
+            seed(args.users, args.leaves, args.drift_every)
+            print(f"{args.users} users, {args.users * 2} balances, {args.users * args.leaves} approved leaves")
+
+            timed("check", check)
+            print(f"check peak Python memory: {peak_memory(check):.1f} MB")
+            timed("check + repair", lambda: check(repair=True))
+            timed("re-check", check)
+
+
+if __name__ == "__main__":
+    main()
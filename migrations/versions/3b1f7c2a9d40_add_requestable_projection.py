@@ -0,0 +1,62 @@
+"""add requestable_days projection and dirty_user queue
+
+Revision ID: 3b1f7c2a9d40
+Revises: e918436c8086
+Create Date: 2026-10-19 10:12:44.201337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f7c2a9d40'
+down_revision = 'e918436c8086'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('requestable_days',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('days', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'year', name='uq_requestable_days_user_year')
+    )
+    with op.batch_alter_table('requestable_days', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_requestable_days_user_id'), ['user_id'], unique=False)
+
+    op.create_table('dirty_user',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('marked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('dirty_user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_dirty_user_marked_at'), ['marked_at'], unique=False)
+
+    # 기존 직원은 모두 재계산 대기 상태로 시작
+    # (user 는 PostgreSQL 예약어이므로 테이블 객체로 식별자를 인용)
+    user = sa.table('user', sa.column('id'))
+    dirty_user = sa.table('dirty_user', sa.column('user_id'), sa.column('marked_at'))
+    op.execute(
+        dirty_user.insert().from_select(
+            ['user_id', 'marked_at'],
+            sa.select(user.c.id, sa.func.current_timestamp()),
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('dirty_user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_dirty_user_marked_at'))
+
+    op.drop_table('dirty_user')
+    with op.batch_alter_table('requestable_days', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_requestable_days_user_id'))
+
+    op.drop_table('requestable_days')
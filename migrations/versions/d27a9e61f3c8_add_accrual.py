@@ -0,0 +1,89 @@
+"""add hire_date, accrual_run and unique leave_balance per year
+
+Revision ID: d27a9e61f3c8
+Revises: 8c4e0d17a5b2
+Create Date: 2026-10-19 13:26:08.913402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd27a9e61f3c8'
+down_revision = '8c4e0d17a5b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('accrual_run',
+    sa.Column('period', sa.String(length=7), nullable=False),
+    sa.Column('users', sa.Integer(), nullable=False),
+    sa.Column('ran_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('period')
+    )
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hire_date', sa.Date(), nullable=True))
+
+    merge_duplicate_balances()
+
+    # 직원·연도별 연차는 한 건만 존재 (일괄 발생의 ON CONFLICT 대상)
+    with op.batch_alter_table('leave_balance', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_leave_balance_user_year', ['user_id', 'year'])
+
+
+def merge_duplicate_balances():
+    """같은 직원·연도의 연차가 여러 건이면 한 건으로 합침
+
+    가장 최근(id 가 큰) 행을 남긴다. 총 연차는 더하지 않고 '설정'하는 값이므로 가장 큰 값,
+    사용/Pending 일수는 어느 행에서 차감되었을지 모르므로 합계, 만료일은 만료 없는 행이
+    있으면 없음(NULL), 아니면 가장 늦은 날짜로 한다.
+    """
+    leave_balance = sa.table(
+        'leave_balance',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('year', sa.Integer),
+        sa.column('total_days', sa.Float), sa.column('used_days', sa.Float),
+        sa.column('pending_days', sa.Float), sa.column('expires_on', sa.Date),
+    )
+    c = leave_balance.c
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.select(
+            c.user_id, c.year,
+            sa.func.max(c.id).label('keep_id'),
+            sa.func.max(c.total_days).label('total_days'),
+            sa.func.sum(sa.func.coalesce(c.used_days, 0.0)).label('used_days'),
+            sa.func.sum(sa.func.coalesce(c.pending_days, 0.0)).label('pending_days'),
+            sa.case(
+                (sa.func.count(c.expires_on) < sa.func.count(), sa.null()),
+                else_=sa.func.max(c.expires_on),
+            ).label('expires_on'),
+        )
+        .group_by(c.user_id, c.year)
+        .having(sa.func.count() > 1)
+    ).all()
+
+    for row in duplicates:
+        bind.execute(
+            leave_balance.update()
+            .where(c.id == row.keep_id)
+            .values(
+                total_days=row.total_days, used_days=row.used_days,
+                pending_days=row.pending_days, expires_on=row.expires_on,
+            )
+        )
+        bind.execute(
+            leave_balance.delete()
+            .where(c.user_id == row.user_id, c.year == row.year, c.id != row.keep_id)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('leave_balance', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_leave_balance_user_year', type_='unique')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('hire_date')
+
+    op.drop_table('accrual_run')
@@ -0,0 +1,54 @@
+"""add department hierarchy and leave indexes
+
+Revision ID: f5b83c0e2d17
+Revises: d27a9e61f3c8
+Create Date: 2026-10-19 14:41:52.306719
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b83c0e2d17'
+down_revision = 'd27a9e61f3c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('department',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['parent_id'], ['department.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('department', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_department_path'), ['path'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('department_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_user_department_id'), ['department_id'], unique=False)
+        batch_op.create_foreign_key('fk_user_department_id', 'department', ['department_id'], ['id'])
+
+    with op.batch_alter_table('leave', schema=None) as batch_op:
+        batch_op.create_index('ix_leave_user_id_start_date', ['user_id', 'start_date'], unique=False)
+        batch_op.create_index('ix_leave_status', ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('leave', schema=None) as batch_op:
+        batch_op.drop_index('ix_leave_status')
+        batch_op.drop_index('ix_leave_user_id_start_date')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_user_department_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_user_department_id'))
+        batch_op.drop_column('department_id')
+
+    with op.batch_alter_table('department', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_department_path'))
+
+    op.drop_table('department')
@@ -1,7 +1,23 @@
+import os
+import sys
+
 from app import create_app
 from app.extensions import db
+from app.projections import start_requestable_worker
 
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    if "--asgi" in sys.argv:
+        # ASGI 모드: JSON API 는 asyncio, HTML 화면은 Flask(WSGI) 그대로
+        import uvicorn
+        from app.asgi import create_asgi_app
+
+        if app.config["REQUESTABLE_WORKER_ENABLED"]:
+            start_requestable_worker(app)
+        uvicorn.run(create_asgi_app(app), host="0.0.0.0", port=5000)
+    else:
+        # 리로더 부모 프로세스에서는 워커를 띄우지 않음
+        if app.config["REQUESTABLE_WORKER_ENABLED"] and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            start_requestable_worker(app)
+        app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,86 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import delete
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.hierarchy import create_department
+from app.models import User, Leave, LeaveBalance, DirtyUser
+from app.projections import recompute_users
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """임시 SQLite 파일을 쓰는 앱 생성 (replica=True 면 두 번째 파일을 replica bind 로 연결)"""
+    def factory(replica=False, **config):
+        primary = tmp_path / "primary.db"
+        monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}")
+        binds = {"replica": f"sqlite:///{tmp_path / 'replica.db'}"} if replica else {}
+        monkeypatch.setattr(Config, "SQLALCHEMY_BINDS", binds)
+        for key, value in config.items():
+            monkeypatch.setattr(Config, key, value)
+
+        app = create_app()
+        app.config["TESTING"] = True
+        with app.app_context():
+            db.create_all(bind_key=None)  # replica 는 primary 파일을 복제해서 만듦
+        return app
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def org(app):
+    """부서 2개(영업/개발), 영업 매니저 1명, 부서별 직원 25명과 각자의 Pending 휴가"""
+    with app.app_context():
+        sales = create_department("영업")
+        dev = create_department("개발")
+        manager = User(name="매니저", email="m@x", role="manager", department=sales)
+        manager.set_password("pw")
+        db.session.add(manager)
+
+        for department in (sales, dev):
+            for i in range(25):
+                user = User(name=f"{department.name}{i}", email=f"{department.name}{i}@x", password_hash="x", department=department)
+                db.session.add(user)
+                db.session.flush()
+                db.session.add_all([
+                    LeaveBalance(user_id=user.id, year=2026, total_days=15, used_days=0),
+                    Leave(user_id=user.id, start_date=date(2026, 5, 4) + timedelta(days=i), end_date=date(2026, 5, 4) + timedelta(days=i), status="Pending", reason=department.name),
+                ])
+        db.session.commit()
+
+        # 프로젝션을 최신 상태로
+        recompute_users([u.id for u in User.query])
+        db.session.execute(delete(DirtyUser))
+        db.session.commit()
+    return app
+
+
+def seed(app):
+    """관리자(a@x), 직원(u@x) 과 직원의 2025/2026 연차, Pending 휴가 2건 생성. 비밀번호는 모두 "pw" """
+    with app.app_context():
+        admin = User(name="관리자", email="a@x", role="admin")
+        user = User(name="직원", email="u@x", role="user")
+        admin.set_password("pw")
+        user.set_password("pw")
+        db.session.add_all([admin, user])
+        db.session.flush()
+        db.session.add_all([
+            LeaveBalance(user_id=user.id, year=2025, total_days=3, used_days=0),
+            LeaveBalance(user_id=user.id, year=2026, total_days=15, used_days=0),
+            Leave(user_id=user.id, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3), status="Pending"),
+            Leave(user_id=user.id, start_date=date(2026, 4, 1), end_date=date(2026, 4, 1), status="Pending"),
+        ])
+        db.session.commit()
+        return {"admin": admin.id, "user": user.id}
+
+
+def login(client, email):
+    return client.post("/auth/login", data={"email": email, "password": "pw"})
+
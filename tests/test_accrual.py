@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+
+from app.accrual import AccrualPolicy, period_end, run_accrual
+from app.config import Config
+from app.extensions import db
+from app.models import User, LeaveBalance
+
+
+@pytest.fixture
+def policy():
+    return AccrualPolicy.from_config(Config.ACCRUAL_POLICY)
+
+
+def add_user(hire_date):
+    user = User(name=str(hire_date), email=f"{hire_date}@x", password_hash="x", hire_date=hire_date)
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def balances(user_id):
+    return {b.year: b.total_days for b in LeaveBalance.query.filter_by(user_id=user_id)}
+
+
+def months_between(hire_date, as_of):
+    return (as_of.year - hire_date.year) * 12 + as_of.month - hire_date.month - (hire_date.day > as_of.day)
+
+
+def test_first_year_accrual_is_not_counted_twice_or_lost(app, policy):
+    with app.app_context():
+        user_id = add_user(date(2025, 3, 1))
+
+        run_accrual("2025-12", policy)
+        assert balances(user_id) == {2025: policy.days_for_months(9)}
+
+        # 2026-02: 근속 11개월. 2025 년분 9일은 다시 더하지 않음
+        run_accrual("2026-02", policy)
+        assert balances(user_id) == {2025: 9.0, 2026: 2.0}
+        assert sum(balances(user_id).values()) == policy.days_for_months(11)
+
+        # 2026-03: 근속 1년. 그 해 이미 발생한 2일에 구간 일수를 더함
+        run_accrual("2026-03", policy)
+        assert balances(user_id) == {2025: 9.0, 2026: 2.0 + policy.days_for_months(12)}
+        assert sum(balances(user_id).values()) == policy.days_for_months(11) + policy.days_for_months(12)
+
+        # 이후 실행해도 같은 값 (다시 더하지 않음), 다음 해부터는 구간 일수만
+        run_accrual("2026-12", policy)
+        run_accrual("2027-03", policy)
+        assert balances(user_id) == {2025: 9.0, 2026: 17.0, 2027: policy.days_for_months(24)}
+
+
+@pytest.mark.parametrize("period", ["2025-06", "2025-12", "2026-01", "2026-02", "2026-07", "2026-12", "2030-05"])
+def test_accrual_matches_policy(app, policy, period):
+    hire_dates = [
+        date(2024, 6, 30), date(2025, 1, 1), date(2025, 1, 31), date(2025, 3, 1),
+        date(2025, 6, 15), date(2025, 11, 30), date(2025, 12, 31), date(2026, 1, 15),
+        date(2019, 2, 28), date(2010, 7, 1),
+    ]
+    as_of = period_end(period)
+    year_end_before = date(as_of.year - 1, 12, 31)
+
+    with app.app_context():
+        user_ids = {add_user(h): h for h in hire_dates}
+        run_accrual(period, policy)
+
+        for user_id, hire_date in user_ids.items():
+            recorded = balances(user_id).get(as_of.year)
+            if hire_date > as_of:
+                assert recorded is None
+                continue
+            expected = policy.days_for_year(months_between(hire_date, as_of), months_between(hire_date, year_end_before))
+            assert recorded == expected, hire_date
@@ -0,0 +1,166 @@
+from datetime import date
+
+from sqlalchemy import delete, update
+
+from app import metrics
+from app.allocation import YearBalance, allocate
+from app.extensions import db
+from app.models import User, Leave, LeaveBalance, DirtyUser, requestable_from
+from app.projections import recompute_users
+
+from .conftest import seed, login
+
+
+# ------------------- allocate() -------------------
+def test_deducts_oldest_year_first_and_spills_over():
+    result = allocate(
+        [YearBalance(2026, 15.0, None), YearBalance(2025, 3.0, None)],
+        [(date(2026, 5, 4), 2.0), (date(2026, 5, 11), 4.0)],
+    )
+    assert result.deductions == [{2025: 2.0}, {2025: 1.0, 2026: 3.0}]
+    assert result.shortfalls == [0.0, 0.0]
+    assert result.remaining == {2025: 0.0, 2026: 12.0}
+
+
+def test_never_uses_a_year_after_the_leave_start():
+    result = allocate(
+        [YearBalance(2025, 1.0, None), YearBalance(2026, 5.0, None)],
+        [(date(2025, 12, 1), 2.0), (date(2026, 1, 5), 2.0)],
+    )
+    # 첫 휴가는 2026 년 연차를 쓰지 못해 부족, 커서는 2026 년을 건너뛰지 않음
+    assert result.deductions == [{2025: 1.0}, {2026: 2.0}]
+    assert result.shortfalls == [1.0, 0.0]
+
+
+def test_expired_year_is_skipped_after_expiry_but_usable_on_the_day():
+    balances = [YearBalance(2025, 5.0, date(2026, 3, 31)), YearBalance(2026, 15.0, None)]
+    result = allocate(balances, [(date(2026, 3, 31), 1.0), (date(2026, 4, 1), 1.0), (date(2026, 4, 2), 1.0)])
+    assert result.deductions == [{2025: 1.0}, {2026: 1.0}, {2026: 1.0}]
+    assert result.remaining == {2025: 4.0, 2026: 13.0}
+
+
+def test_exhausted_and_negative_years_are_not_reused():
+    result = allocate(
+        [YearBalance(2024, -1.0, None), YearBalance(2025, 1.0, None), YearBalance(2026, 2.0, None)],
+        [(date(2026, 1, 5), 1.0), (date(2026, 1, 6), 1.0), (date(2026, 1, 7), 3.0)],
+    )
+    assert result.deductions == [{2025: 1.0}, {2026: 1.0}, {2026: 1.0}]
+    assert result.shortfalls == [0.0, 0.0, 2.0]
+    assert result.remaining == {2024: 0.0, 2025: 0.0, 2026: 0.0}
+
+
+def test_no_balances_is_all_shortfall():
+    result = allocate([], [(date(2026, 1, 5), 1.5)])
+    assert result.deductions == [{}]
+    assert result.shortfalls == [1.5]
+
+
+def test_requestable_excludes_expired_carry_over():
+    balances = [YearBalance(2025, 3.0, date(2026, 3, 31)), YearBalance(2026, 15.0, None)]
+    assert requestable_from(balances, [], as_of=date(2026, 3, 31)) == {2025: 3.0, 2026: 15.0}
+    assert requestable_from(balances, [], as_of=date(2026, 4, 1)) == {2026: 15.0}
+
+
+# ------------------- 승인 / 삭제 -------------------
+def used_days(app, user_id):
+    with app.app_context():
+        return {b.year: b.used_days for b in LeaveBalance.query.filter_by(user_id=user_id)}
+
+
+def test_approve_with_shortfall_leaves_balances_untouched(app):
+    ids = seed(app)
+    with app.app_context():
+        # 2026-06 평일 22일 > 남은 연차 18일
+        leave = Leave(user_id=ids["user"], start_date=date(2026, 6, 1), end_date=date(2026, 6, 30), status="Pending")
+        db.session.add(leave)
+        db.session.commit()
+        leave_id = leave.id
+
+    client = app.test_client()
+    login(client, "a@x")
+    before = metrics.balance_shortfalls.value()
+
+    assert client.post(f"/leaves/{leave_id}/approve").status_code == 400
+    assert used_days(app, ids["user"]) == {2025: 0.0, 2026: 0.0}
+    assert metrics.balance_shortfalls.value() == before + 1
+    with app.app_context():
+        assert db.session.get(Leave, leave_id).status == "Pending"
+
+
+def test_approve_deducts_oldest_year_first(app):
+    ids = seed(app)
+    client = app.test_client()
+    login(client, "a@x")
+
+    # 2026-03-02 ~ 03-03 (2일) → 2025 년 3일에서 차감
+    assert client.post("/leaves/1/approve").status_code == 302
+    assert used_days(app, ids["user"]) == {2025: 2.0, 2026: 0.0}
+
+
+def test_delete_restores_oldest_year_first(app):
+    ids = seed(app)
+    with app.app_context():
+        for balance in LeaveBalance.query.filter_by(user_id=ids["user"]):
+            balance.used_days = {2025: 2.0, 2026: 3.0}[balance.year]
+        leave = Leave(user_id=ids["user"], start_date=date(2026, 7, 6), end_date=date(2026, 7, 8), status="Approved")
+        db.session.add(leave)
+        db.session.commit()
+        leave_id = leave.id
+
+    client = app.test_client()
+    login(client, "a@x")
+
+    assert client.post(f"/leaves/{leave_id}/delete").status_code == 302
+    assert used_days(app, ids["user"]) == {2025: 0.0, 2026: 2.0}
+
+
+# ------------------- 연차 부여 화면 -------------------
+def expires_on(app, user_id, year):
+    with app.app_context():
+        return LeaveBalance.query.filter_by(user_id=user_id, year=year).one().expires_on
+
+
+def test_saving_balance_without_expiry_keeps_existing_expiry(app):
+    ids = seed(app)
+    client = app.test_client()
+    login(client, "a@x")
+    form = {"user_id": ids["user"], "year": 2025, "total_days": 3}
+
+    client.post("/leave-balance/add", data={**form, "expires_on": "2026-03-31"})
+    client.post("/leave-balance/add", data={**form, "total_days": 4, "expires_on": ""})
+    assert expires_on(app, ids["user"], 2025) == date(2026, 3, 31)
+
+    client.post("/leave-balance/add", data={**form, "expires_on": "", "clear_expires_on": "on"})
+    assert expires_on(app, ids["user"], 2025) is None
+
+
+def test_expired_carry_over_is_not_requestable(app):
+    ids = seed(app)
+    with app.app_context():
+        balance = LeaveBalance.query.filter_by(user_id=ids["user"], year=2025).one()
+        balance.expires_on = date.today().replace(year=date.today().year - 1)
+        db.session.commit()
+
+        user = db.session.get(User, ids["user"])
+        assert 2025 not in user.compute_requestable_leave_by_year()
+        assert 2025 not in user.requestable_leave_by_year
+
+
+def test_projection_computed_before_expiry_drops_expired_year(app):
+    ids = seed(app)
+    with app.app_context():
+        # Pending 휴가가 2025 년분을 다 쓰지 않도록 반려 처리
+        db.session.execute(update(Leave).values(status="Rejected"))
+        recompute_users([ids["user"]])
+        db.session.execute(delete(DirtyUser))
+        # 프로젝션 계산 이후 만료일이 지난 상황 (대기열 표시 없이 만료일만 과거로)
+        db.session.execute(
+            update(LeaveBalance)
+            .where(LeaveBalance.user_id == ids["user"], LeaveBalance.year == 2025)
+            .values(expires_on=date(2000, 1, 1))
+        )
+        db.session.commit()
+
+        user = db.session.get(User, ids["user"])
+        assert {r.year for r in user.requestable_projection} == {2025, 2026}
+        assert list(user.requestable_leave_by_year) == [2026]
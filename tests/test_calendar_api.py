@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+from app import routes
+from app.extensions import db
+from app.models import User, Department
+from app.routes import calendar_stats, load_calendar_events
+from app.throttle import SingleFlight, AsyncSingleFlight
+
+from .conftest import seed, login
+
+
+def test_concurrent_requests_are_all_counted(make_app):
+    app = make_app(CALENDAR_RATE_BURST=1000)
+    seed(app)
+    before = calendar_stats()
+
+    def fetch():
+        client = app.test_client()
+        login(client, "a@x")
+        for _ in range(20):
+            assert client.get("/api/leaves?start=2026-03-01&end=2026-04-01").status_code == 200
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    after = calendar_stats()
+    delta = {key: after[key] - before[key] for key in after}
+    assert delta["requests"] == 160
+    # 모든 요청은 캐시 적중 / 합쳐짐 / 직접 조회 중 하나로 처리됨
+    assert delta["cache_hits"] + delta["coalesced"] + delta["computed"] == 160
+    assert delta["throttled"] == 0
+
+
+def test_burst_exceeded_returns_429_with_retry_after(make_app):
+    app = make_app(CALENDAR_RATE_BURST=2, CALENDAR_RATE_PER_SECOND=0.5)
+    seed(app)
+    client = app.test_client()
+    login(client, "u@x")
+
+    statuses = [client.get("/api/leaves").status_code for _ in range(2)]
+    throttled = client.get("/api/leaves")
+
+    assert statuses == [200, 200]
+    assert throttled.status_code == 429
+    # 토큰 하나가 다시 차는 데 2초
+    assert throttled.headers["Retry-After"] == "2"
+
+    # 다른 사용자는 따로 계산
+    other = app.test_client()
+    login(other, "a@x")
+    assert other.get("/api/leaves").status_code == 200
+
+
+def test_concurrent_identical_windows_load_once(app, monkeypatch):
+    seed(app)
+    calls = []
+
+    def slow_load(*window, **kwargs):
+        calls.append(window)
+        time.sleep(0.3)
+        return load_calendar_events(*window, **kwargs)
+
+    monkeypatch.setattr(routes, "load_calendar_events", slow_load)
+
+    clients = []
+    for _ in range(6):
+        client = app.test_client()
+        login(client, "a@x")
+        clients.append(client)
+    barrier = threading.Barrier(len(clients))
+    bodies = []
+
+    def fetch(client):
+        barrier.wait()
+        bodies.append(client.get("/api/leaves?start=2026-03-01&end=2026-05-01").get_json())
+
+    threads = [threading.Thread(target=fetch, args=(c,)) for c in clients]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(bodies) == 6 and all(body == bodies[0] for body in bodies)
+    assert len(bodies[0]) == 2
+
+
+def test_cache_is_keyed_by_department_scope(org, monkeypatch):
+    calls = []
+
+    def counting_load(*window, **kwargs):
+        calls.append(window)
+        return load_calendar_events(*window, **kwargs)
+
+    monkeypatch.setattr(routes, "load_calendar_events", counting_load)
+    with org.app_context():
+        dev = Department.query.filter_by(name="개발").one()
+        dev_manager = User(name="개발 매니저", email="dm@x", role="manager", department=dev)
+        dev_manager.set_password("pw")
+        db.session.add(dev_manager)
+        db.session.commit()
+
+    def events_for(email):
+        client = org.test_client()
+        login(client, email)
+        return client.get("/api/leaves?start=2026-05-01&end=2026-07-01").get_json()
+
+    sales_events = events_for("m@x")
+    dev_events = events_for("dm@x")
+    assert events_for("m@x") == sales_events  # 캐시 적중
+
+    assert len(calls) == 2
+    assert {e["title"][:2] for e in sales_events} == {"영업"}
+    assert {e["title"][:2] for e in dev_events} == {"개발"}
+
+
+def test_leader_exception_propagates_to_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("조회 실패")
+
+    def call(fn):
+        try:
+            flight.do("window", fn)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call, args=(failing,))
+    leader.start()
+    started.wait()
+    waiters = [threading.Thread(target=call, args=(lambda: "실행되면 안 됨",)) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    time.sleep(0.1)  # 기다리는 요청이 모두 합류하도록
+    release.set()
+    for t in [leader, *waiters]:
+        t.join()
+
+    assert len(errors) == 4
+    assert all(e is errors[0] for e in errors)
+    # 실패한 키는 정리되어 다음 요청은 새로 계산
+    assert flight.do("window", lambda: "ok") == ("ok", False)
+
+
+def test_async_leader_exception_propagates_to_waiters():
+    flight = AsyncSingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("조회 실패")
+
+    async def not_called():
+        raise AssertionError("기다리는 요청은 계산하지 않음")
+
+    async def run():
+        leader = asyncio.create_task(flight.do("window", failing))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do("window", not_called)) for _ in range(3)]
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [RuntimeError] * 4
@@ -0,0 +1,82 @@
+import csv
+import io
+import re
+from datetime import date
+
+from sqlalchemy import delete
+
+from app.consistency import check_balances_command
+from app.extensions import db
+from app.models import User, Leave, LeaveBalance, DirtyUser
+
+from .conftest import seed
+
+
+def seed_drift(app):
+    """직원(u@x) 연차 2건에 차이, 연차가 없는 직원(n@x) 의 승인 휴가 2일"""
+    ids = seed(app)
+    with app.app_context():
+        # 2025 년 이월 연차는 3월 말 만료 → 3/2~3/3 은 2025 년에서, 4/1 은 2026 년에서 차감되어야 함
+        balances = {b.year: b for b in LeaveBalance.query.filter_by(user_id=ids["user"])}
+        balances[2025].expires_on = date(2026, 3, 31)
+        balances[2025].used_days = 0
+        balances[2026].used_days = 3
+        for leave in Leave.query.filter_by(user_id=ids["user"]):
+            leave.status = "Approved"
+
+        no_balance = User(name="연차 없음", email="n@x", role="user", password_hash="x")
+        db.session.add(no_balance)
+        db.session.flush()
+        db.session.add(Leave(user_id=no_balance.id, start_date=date(2026, 5, 4), end_date=date(2026, 5, 5), status="Approved"))
+
+        db.session.commit()
+        db.session.execute(delete(DirtyUser))
+        db.session.commit()
+        ids["no_balance"] = no_balance.id
+        ids["balances"] = {year: b.id for year, b in balances.items()}
+    return ids
+
+
+def test_check_balances_repair(app):
+    ids = seed_drift(app)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(check_balances_command, ["--repair"])
+    assert result.exit_code == 0, result.output
+
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert rows == [
+        {"balance_id": str(ids["balances"][2025]), "user_id": str(ids["user"]), "year": "2025",
+         "recorded_used_days": "0.0", "expected_used_days": "2.0", "difference": "-2.0"},
+        {"balance_id": str(ids["balances"][2026]), "user_id": str(ids["user"]), "year": "2026",
+         "recorded_used_days": "3.0", "expected_used_days": "1.0", "difference": "2.0"},
+    ]
+    assert re.fullmatch(
+        r"연차 2건 검사, 차이 2건 수정, 차감 불가 승인 휴가 2일 \(\d+\.\d\ds\)\n", result.stderr
+    )
+
+    with app.app_context():
+        used = {b.year: b.used_days for b in LeaveBalance.query.filter_by(user_id=ids["user"])}
+        assert used == {2025: 2.0, 2026: 1.0}
+        # 고친 직원만 신청 가능 연차 재계산 대기열에 추가
+        assert [d.user_id for d in DirtyUser.query] == [ids["user"]]
+
+    # 다시 검사하면 연차가 없는 직원의 휴가만 남음
+    result = runner.invoke(check_balances_command, ["--format", "jsonl"])
+    assert result.exit_code == 0, result.output
+    assert result.stdout == ""
+    assert result.stderr.startswith("연차 2건 검사, 차이 0건, 차감 불가 승인 휴가 2일 ")
+
+
+def test_check_balances_without_repair_changes_nothing(app):
+    ids = seed_drift(app)
+
+    result = app.test_cli_runner().invoke(check_balances_command, [])
+    assert result.exit_code == 0, result.output
+    assert len(list(csv.DictReader(io.StringIO(result.stdout)))) == 2
+    assert "차이 2건," in result.stderr
+
+    with app.app_context():
+        used = {b.year: b.used_days for b in LeaveBalance.query.filter_by(user_id=ids["user"])}
+        assert used == {2025: 0.0, 2026: 3.0}
+        assert DirtyUser.query.count() == 0
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import re
+from datetime import date
+
+from sqlalchemy import delete
+
+from app.asgi import create_asgi_app
+from app.extensions import db
+from app.metrics import db_queries
+from app.models import User, Department, Leave, LeaveBalance, DirtyUser
+from app.projections import recompute_users
+
+from .conftest import login
+
+
+def query_count(fn):
+    before = sum(db_queries._shards.collect().values())
+    result = fn()
+    return result, sum(db_queries._shards.collect().values()) - before
+
+
+def test_manager_leave_list_is_scoped_and_eager_loaded(org):
+    client = org.test_client()
+    login(client, "m@x")
+
+    response, queries = query_count(lambda: client.get("/leaves?view=pending"))
+
+    page = response.get_data(as_text=True)
+    assert len(re.findall(r"<td>영업\d+</td>", page)) == 25
+    assert "개발" not in page
+    # 행 수와 상관없이 일정 (직원 / 범위 / 휴가 + 연차·프로젝션·재계산 표시 일괄 로드)
+    assert queries <= 10
+
+
+def test_calendar_requires_login(org):
+    client = org.test_client()
+    assert client.get("/api/leaves").status_code == 401
+
+    login(client, "m@x")
+    events = client.get("/api/leaves").get_json()
+    assert len(events) == 25
+
+
+async def asgi_get(asgi, path, cookie=None, query=b""):
+    """ASGI 앱에 GET 요청 scope 를 직접 넘겨 (상태 코드, JSON 본문) 반환"""
+    headers = [(b"host", b"test")]
+    if cookie:
+        headers.append((b"cookie", f"session={cookie}".encode()))
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+        "query_string": query, "headers": headers, "client": ("127.0.0.1", 1), "server": ("test", 80),
+        "scheme": "http", "http_version": "1.1", "root_path": "", "asgi": {"version": "3.0"},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi(scope, receive, send)
+    return messages[0]["status"], json.loads(messages[1]["body"])
+
+
+def run_asgi(asgi, *calls):
+    """(경로, 쿠키[, 쿼리]) 요청들을 차례로 보내고 결과 목록 반환 (끝나면 async 엔진 정리)"""
+    async def run():
+        try:
+            return [await asgi_get(asgi, *call) for call in calls]
+        finally:
+            await asgi.engine.dispose()
+    return asyncio.run(run())
+
+
+def test_asgi_calendar_requires_login(org):
+    asgi = create_asgi_app(org)
+    client = org.test_client()
+    login(client, "m@x")
+    cookie = client.get_cookie("session").value
+
+    # 로그인 후 삭제된 사용자의 쿠키
+    with org.app_context():
+        sales = Department.query.filter_by(name="영업").one()
+        gone = User(name="퇴사자", email="gone@x", role="user", department=sales)
+        gone.set_password("pw")
+        db.session.add(gone)
+        db.session.commit()
+    gone_client = org.test_client()
+    login(gone_client, "gone@x")
+    gone_cookie = gone_client.get_cookie("session").value
+    with org.app_context():
+        db.session.delete(User.query.filter_by(email="gone@x").one())
+        db.session.commit()
+
+    (anonymous, _), (member, events), (bad_day, _), *deleted = run_asgi(
+        asgi,
+        ("/api/leaves", None),
+        ("/api/leaves", cookie),
+        ("/api/leaves", cookie, b"start=2026-13-01"),
+        ("/api/leaves", gone_cookie),
+        ("/api/me/leaves", gone_cookie),
+        ("/api/me/balances", gone_cookie),
+    )
+    assert (anonymous, member, bad_day) == (401, 200, 400)
+    # 전사 범위로 취급하지 않고 거절
+    assert [status for status, _ in deleted] == [401, 401, 401]
+    assert {e["title"][:2] for e in events} == {"영업"}
+
+
+def test_asgi_my_leaves_and_balances(org):
+    client = org.test_client()
+    login(client, "m@x")
+    cookie = client.get_cookie("session").value
+
+    with org.app_context():
+        manager_id = User.query.filter_by(email="m@x").one().id
+        db.session.add(LeaveBalance(user_id=manager_id, year=2026, total_days=15, used_days=0))
+        db.session.commit()
+        recompute_users([manager_id])
+        db.session.execute(delete(DirtyUser))
+        db.session.commit()
+
+    # 프로젝션이 최신일 때
+    (_, fresh), = run_asgi(create_asgi_app(org), ("/api/me/balances", cookie))
+    assert [(b["year"], b["requestable_days"]) for b in fresh] == [(2026, 15)]
+
+    # 신청 직후 재계산 대기 중이면 프로젝션(15일) 대신 직접 계산
+    with org.app_context():
+        db.session.add(Leave(user_id=manager_id, start_date=date(2026, 6, 1), end_date=date(2026, 6, 2), status="Pending"))
+        db.session.commit()
+        assert db.session.get(DirtyUser, manager_id) is not None
+
+    (anonymous, _), (_, leaves), (_, balances) = run_asgi(
+        create_asgi_app(org),
+        ("/api/me/leaves", None),
+        ("/api/me/leaves", cookie),
+        ("/api/me/balances", cookie),
+    )
+    assert anonymous == 401
+    assert [(l["start_date"], l["status"], l["days"]) for l in leaves] == [("2026-06-01", "Pending", 2)]
+    assert balances == [{
+        "year": 2026, "total_days": 15, "used_days": 0, "remaining_days": 15,
+        "requestable_days": 13, "expires_on": None,
+    }]
@@ -0,0 +1,95 @@
+import threading
+
+from app.extensions import db
+from app.models import Leave
+
+from .conftest import seed, login
+
+
+def leave_form(user_id, **fields):
+    form = {"user_id": user_id, "start_date": "2026-05-04", "end_date": "2026-05-05", "reason": "여행"}
+    form.update(fields)
+    return form
+
+
+def count_leaves(app, **filters):
+    with app.app_context():
+        return db.session.query(Leave).filter_by(**filters).count()
+
+
+def test_concurrent_duplicate_submissions_create_one_leave(app):
+    ids = seed(app)
+    form = leave_form(ids["user"], idempotency_key="double-click")
+    clients = []
+    for _ in range(8):
+        client = app.test_client()
+        login(client, "u@x")
+        clients.append(client)
+
+    barrier = threading.Barrier(len(clients))
+    statuses = []
+
+    def submit(client):
+        barrier.wait()
+        statuses.append(client.post("/leaves/add", data=form).status_code)
+
+    threads = [threading.Thread(target=submit, args=(c,)) for c in clients]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses == [302] * 8
+    assert count_leaves(app, reason="여행") == 1
+
+
+def test_same_key_on_different_leaves_is_not_replayed(app):
+    seed(app)
+    client = app.test_client()
+    login(client, "a@x")
+
+    headers = {"Idempotency-Key": "same-key"}
+    assert client.post("/leaves/1/approve", headers=headers).status_code == 302
+    assert client.post("/leaves/2/approve", headers=headers).status_code == 302
+
+    assert count_leaves(app, status="Approved") == 2
+
+
+def test_replay_returns_stored_outcome(app):
+    seed(app)
+    client = app.test_client()
+    login(client, "a@x")
+
+    headers = {"Idempotency-Key": "retry"}
+    first = client.post("/leaves/1/approve", headers=headers)
+    again = client.post("/leaves/1/approve", headers=headers)
+
+    # 두 번째 요청도 처리된 것처럼 응답 ("이미 처리된 휴가" 400 이 아님)
+    assert (first.status_code, again.status_code) == (302, 302)
+    assert again.headers["Location"] == first.headers["Location"]
+
+
+def test_validation_failure_is_not_cached(app):
+    ids = seed(app)
+    client = app.test_client()
+    login(client, "u@x")
+
+    # 신청 가능 연차 초과 → 400
+    too_long = leave_form(ids["user"], end_date="2026-06-30", idempotency_key="form-1")
+    assert client.post("/leaves/add", data=too_long).status_code == 400
+
+    # 고쳐서 같은 키로 다시 제출하면 처리됨
+    fixed = leave_form(ids["user"], idempotency_key="form-1")
+    assert client.post("/leaves/add", data=fixed).status_code == 302
+    assert count_leaves(app, reason="여행") == 1
+
+
+def test_key_reused_with_different_body_is_rejected(app):
+    ids = seed(app)
+    client = app.test_client()
+    login(client, "u@x")
+
+    assert client.post("/leaves/add", data=leave_form(ids["user"], idempotency_key="k")).status_code == 302
+    other = leave_form(ids["user"], start_date="2026-06-01", end_date="2026-06-01", idempotency_key="k")
+    assert client.post("/leaves/add", data=other).status_code == 422
+    assert count_leaves(app, reason="여행") == 1
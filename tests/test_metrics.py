@@ -0,0 +1,108 @@
+import re
+from datetime import date
+
+import pytest
+
+from app.extensions import db
+from app.metrics import DEFAULT_BUCKETS, Registry
+from app.models import Leave
+
+from .conftest import seed, login
+
+
+def scrape(client):
+    """/metrics 응답 → {'이름{레이블}': 값}"""
+    text = client.get("/metrics").get_data(as_text=True)
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_unhandled_errors_are_recorded_as_500(app):
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_url_rule("/boom", "boom", boom)
+    client = app.test_client()
+    key = 'http_requests_total{endpoint="boom",method="GET",status="500"}'
+
+    # 테스트 모드: 예외가 그대로 전달되어 after_request 를 건너뜀
+    with pytest.raises(RuntimeError):
+        client.get("/boom")
+    assert scrape(client)[key] == 1
+
+    # 운영 모드: 500 응답
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    assert client.get("/boom").status_code == 500
+    samples = scrape(client)
+    assert samples[key] == 2
+    assert samples['http_request_duration_seconds_count{endpoint="boom",method="GET"}'] == 2
+
+
+def test_request_histogram_buckets(app):
+    client = app.test_client()
+    labels = 'endpoint="auth.login",method="GET"'
+    count_key = f"http_request_duration_seconds_count{{{labels}}}"
+    before = scrape(client).get(count_key, 0)
+    for _ in range(3):
+        client.get("/auth/login")
+
+    samples = scrape(client)
+    buckets = [
+        (match.group(1), value) for name, value in samples.items()
+        if (match := re.fullmatch(r'http_request_duration_seconds_bucket\{' + labels + r',le="([^"]+)"\}', name))
+    ]
+
+    assert [bound for bound, _ in buckets][-1] == "+Inf"
+    assert len(buckets) == len(DEFAULT_BUCKETS) + 1
+    counts = [value for _, value in buckets]
+    assert counts == sorted(counts)  # 누적 개수
+    assert counts[-1] == samples[count_key] == before + 3
+    assert samples[f"http_request_duration_seconds_sum{{{labels}}}"] > 0
+    assert samples[f'http_requests_total{{{labels},status="200"}}'] >= 3
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.counter("escaped_total", "레이블 이스케이프", ("path",))
+    counter.inc(path='C:\\a "b"\nc')
+
+    assert 'escaped_total{path="C:\\\\a \\"b\\"\\nc"} 1' in registry.render().splitlines()
+
+
+def test_leave_counters_follow_routes(app):
+    ids = seed(app)
+    with app.app_context():
+        # 연차(2025 3일 + 2026 15일)보다 긴 휴가
+        too_long = Leave(user_id=ids["user"], start_date=date(2026, 6, 1), end_date=date(2026, 7, 31), status="Pending")
+        db.session.add(too_long)
+        db.session.commit()
+        too_long_id = too_long.id
+
+    user = app.test_client()
+    login(user, "u@x")
+    admin = app.test_client()
+    login(admin, "a@x")
+    before = scrape(admin)
+
+    # 2026-04-01 에 이미 신청한 휴가와 겹침
+    user.post("/leaves/add", data={
+        "user_id": ids["user"], "start_date": "2026-04-01", "end_date": "2026-04-02", "reason": "겹침",
+    })
+    admin.post("/leaves/1/approve")
+    assert admin.post(f"/leaves/{too_long_id}/approve").status_code == 400
+    admin.post("/leaves/2/reject")
+
+    after = scrape(admin)
+    delta = {name: after[name] - before[name] for name in (
+        "leave_overlap_rejections_total", "leave_approvals_total",
+        "leave_balance_shortfalls_total", "leave_rejections_total", "db_queries_total",
+    )}
+    assert delta["leave_overlap_rejections_total"] == 1
+    assert delta["leave_approvals_total"] == 1
+    assert delta["leave_balance_shortfalls_total"] == 1
+    assert delta["leave_rejections_total"] == 1
+    assert delta["db_queries_total"] > 0
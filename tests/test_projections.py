@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from app import metrics
+from app.extensions import db
+from app.models import User, Leave, LeaveBalance, DirtyUser
+from app.projections import process_batch, read_requestable, recompute_users, staleness_metrics
+
+from .conftest import seed
+
+
+def dirty_user_ids():
+    return {marker.user_id for marker in DirtyUser.query}
+
+
+def clear_queue():
+    db.session.execute(delete(DirtyUser))
+    db.session.commit()
+
+
+@pytest.fixture
+def users(app):
+    """seed 데이터 + 연차 없는 두 번째 직원, 재계산 대기열은 빈 상태"""
+    ids = seed(app)
+    with app.app_context():
+        other = User(name="직원2", email="v@x", password_hash="x")
+        db.session.add(other)
+        db.session.commit()
+        ids["other"] = other.id
+        recompute_users([ids["user"], ids["other"]])
+        clear_queue()
+    return ids
+
+
+def test_editing_a_leave_marks_its_user_dirty(app, users):
+    with app.app_context():
+        leave = db.session.get(Leave, 1)
+        leave.end_date = leave.end_date + timedelta(days=1)
+        db.session.commit()
+
+        assert dirty_user_ids() == {users["user"]}
+
+
+def test_moving_a_leave_marks_both_users_dirty(app, users):
+    with app.app_context():
+        db.session.get(Leave, 1).user_id = users["other"]
+        db.session.commit()
+
+        assert dirty_user_ids() == {users["user"], users["other"]}
+
+
+def test_balance_change_marks_user_dirty(app, users):
+    with app.app_context():
+        db.session.add(LeaveBalance(user_id=users["other"], year=2026, total_days=10))
+        db.session.commit()
+
+        assert dirty_user_ids() == {users["other"]}
+
+
+def test_user_remarked_during_batch_stays_queued(app, users):
+    with app.app_context():
+        db.session.get(Leave, 1).reason = "변경"
+        db.session.get(Leave, 2).user_id = users["other"]
+        db.session.commit()
+        batch = [(m.user_id, m.marked_at) for m in DirtyUser.query]
+
+        # 묶음을 읽은 뒤 처리하기 전에 직원이 다시 변경됨
+        db.session.get(DirtyUser, users["other"]).marked_at = datetime.now() + timedelta(seconds=1)
+        db.session.commit()
+
+        process_batch(batch)
+
+        assert dirty_user_ids() == {users["other"]}
+
+
+def test_projection_matches_sync_calculation(app, users):
+    with app.app_context():
+        db.session.add_all([
+            LeaveBalance(user_id=users["other"], year=2025, total_days=2, expires_on=date(2026, 3, 31)),
+            LeaveBalance(user_id=users["other"], year=2026, total_days=15),
+            Leave(user_id=users["other"], start_date=date(2026, 2, 2), end_date=date(2026, 2, 4), status="Pending"),
+            Leave(user_id=users["other"], start_date=date(2026, 6, 1), end_date=date(2026, 6, 1), half_day=True, status="Pending"),
+        ])
+        db.session.commit()
+        process_batch([(m.user_id, m.marked_at) for m in DirtyUser.query])
+        assert dirty_user_ids() == set()
+
+        before = staleness_metrics()
+        for user in User.query:
+            assert read_requestable(user) == user.compute_requestable_leave_by_year()
+        after = staleness_metrics()
+
+        assert after["projection_reads"] - before["projection_reads"] == User.query.count()
+        assert after["stale_reads"] == before["stale_reads"]
+
+
+def test_dirty_user_reads_fall_back_to_sync_calculation(app, users):
+    with app.app_context():
+        db.session.get(Leave, 1).status = "Rejected"
+        db.session.commit()
+
+        before = metrics.requestable_stale_reads.value()
+        user = db.session.get(User, users["user"])
+        assert read_requestable(user) == user.compute_requestable_leave_by_year()
+        assert metrics.requestable_stale_reads.value() == before + 1
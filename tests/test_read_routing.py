@@ -0,0 +1,83 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from .conftest import seed, login
+
+
+@pytest.fixture
+def replicated(make_app, tmp_path):
+    """primary.db 를 채운 뒤 replica.db 로 복제한 상태의 앱 (이후 복제는 일어나지 않음)"""
+    app = make_app(replica=True)
+    ids = seed(app)
+    shutil.copy(tmp_path / "primary.db", tmp_path / "replica.db")
+    return app, ids, tmp_path
+
+
+def leave_reasons(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT reason FROM leave")}
+
+
+def read_from_replica(client):
+    # 로그인(POST) 직후의 기본 엔진 고정 시간을 지워 다음 GET 이 replica 로 가도록 함
+    with client.session_transaction() as session:
+        session.pop("read_primary_until", None)
+
+
+def test_write_goes_to_primary_only(replicated):
+    app, ids, tmp_path = replicated
+    client = app.test_client()
+    login(client, "u@x")
+
+    response = client.post("/leaves/add", data={
+        "user_id": ids["user"], "start_date": "2026-05-04", "end_date": "2026-05-04", "reason": "복제 전",
+    })
+
+    assert response.status_code == 302
+    assert "복제 전" in leave_reasons(tmp_path / "primary.db")
+    assert "복제 전" not in leave_reasons(tmp_path / "replica.db")
+
+
+def test_write_visible_within_read_after_write_window(replicated):
+    app, ids, _ = replicated
+    client = app.test_client()
+    login(client, "u@x")
+
+    client.post("/leaves/add", data={
+        "user_id": ids["user"], "start_date": "2026-05-04", "end_date": "2026-05-04", "reason": "복제 전",
+    })
+
+    # READ_AFTER_WRITE_SECONDS 안의 GET 은 기본 엔진에서 읽음
+    assert "복제 전" in client.get("/leaves").get_data(as_text=True)
+
+
+def test_write_absent_when_routed_to_replica(replicated):
+    app, ids, _ = replicated
+    writer = app.test_client()
+    login(writer, "u@x")
+    writer.post("/leaves/add", data={
+        "user_id": ids["user"], "start_date": "2026-05-04", "end_date": "2026-05-04", "reason": "복제 전",
+    })
+
+    reader = app.test_client()
+    login(reader, "u@x")
+    read_from_replica(reader)
+
+    page = reader.get("/leaves").get_data(as_text=True)
+    assert "복제 전" not in page
+    # replica 에 이미 있던 데이터는 보임
+    assert "2026-03-02" in page
+
+
+def test_without_replica_bind_reads_use_primary(app):
+    ids = seed(app)
+    client = app.test_client()
+    login(client, "u@x")
+    client.post("/leaves/add", data={
+        "user_id": ids["user"], "start_date": "2026-05-04", "end_date": "2026-05-04", "reason": "단일 DB",
+    })
+    read_from_replica(client)
+
+    assert "단일 DB" in client.get("/leaves").get_data(as_text=True)